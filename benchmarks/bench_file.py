@@ -0,0 +1,129 @@
+"""
+Compare `scrub file` against the stdin path on a large generated file.
+
+Each mode runs in its own subprocess so peak RSS can be read per run. The
+stdin baseline raises spaCy's max_length so it can analyze the whole input in
+one pass; a mode that fails is reported and the other still runs. Fails if
+`scrub file` peak RSS grows by more than --max-rss-growth-mb over a 1 MB run.
+Requires the spaCy model(s) from the active config to be installed.
+
+Usage:
+
+    python benchmarks/bench_file.py [--size-mb 1024] [--workdir /tmp] [--max-rss-growth-mb 64]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LINES = [
+    "2024-05-01 12:00:01 INFO request handled in 12ms path=/api/v1/items status=200\n",
+    "Contact Jane Smith at jane.smith@example.com or 07700 900123 for access.\n",
+    "def handler(event, context): return {'statusCode': 200, 'body': event}\n",
+    "Das Treffen mit Herrn Müller ist am Montag in Berlin.\n",
+]
+
+
+# `scrub --stdin`, with spaCy's max_length raised to fit the whole input
+STDIN_BASELINE = (
+    "import sys;"
+    "from scrub import Config, TextScrubber;"
+    "scrubber = TextScrubber(config=Config.load());"
+    "text = sys.stdin.read();"
+    "language = scrubber.detect_language(text);"
+    "scrubber.analyzers.get(language).nlp_engine.get_nlp(language).max_length = len(text) + 1;"
+    "sys.stdout.write(scrubber.scrub(text, language=language))"
+)
+
+
+def generate(path: Path, size_mb: int) -> None:
+    """Write roughly size_mb megabytes of mixed log, prose and code lines."""
+    block = "".join(LINES * 256).encode("utf-8")
+    with open(path, "wb") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block) + 1):
+            f.write(block)
+
+
+def run(cmd, stdin_path=None, stdout_path=None) -> tuple:
+    """Run a command; return wall seconds and the child's peak RSS in MB."""
+    code = (
+        "import resource, subprocess, sys;"
+        "stdin = open(sys.argv[1], 'rb') if sys.argv[1] else None;"
+        "stdout = open(sys.argv[2], 'wb') if sys.argv[2] else None;"
+        "code = subprocess.run(sys.argv[3:], stdin=stdin, stdout=stdout).returncode;"
+        "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss);"
+        "sys.exit(code)"
+    )
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", code, stdin_path or "", stdout_path or "", *cmd],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    maxrss = int(out.stdout.strip().splitlines()[-1])
+    # ru_maxrss is KB on Linux, bytes on macOS
+    rss_mb = maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+    return elapsed, rss_mb
+
+
+def report(label: str, cmd, size_mb: float, **kwargs):
+    """Run one mode and print its time and peak RSS; return the RSS, or None on failure."""
+    try:
+        t, rss = run(cmd, **kwargs)
+    except subprocess.CalledProcessError as e:
+        reason = e.stderr.strip().splitlines()[-1] if e.stderr and e.stderr.strip() else e
+        print(f"{label}: failed ({reason})")
+        return None
+    print(f"{label}: {t:8.1f}s  peak RSS {rss:8.0f} MB ({rss / size_mb:.2f}x input)")
+    return rss
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--workdir", type=Path, default=Path(tempfile.gettempdir()))
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64)
+    args = parser.parse_args()
+
+    small = args.workdir / "scrub_bench_small.txt"
+    src = args.workdir / "scrub_bench_input.txt"
+    out = args.workdir / "scrub_bench_output.txt"
+    generate(small, 1)
+    generate(src, args.size_mb)
+    size_mb = os.path.getsize(src) / (1024 * 1024)
+    print(f"input: {size_mb:.0f} MB")
+
+    scrub = [sys.executable, "-m", "scrub.cli"]
+    try:
+        base_rss = report("scrub file 1 MB", scrub + ["file", str(small), "-o", str(out)], 1)
+        file_rss = report("scrub file     ", scrub + ["file", str(src), "-o", str(out)], size_mb)
+        report(
+            "scrub stdin    ",
+            [sys.executable, "-c", STDIN_BASELINE],
+            size_mb,
+            stdin_path=str(src),
+            stdout_path=str(out),
+        )
+    finally:
+        for path in (small, src, out):
+            path.unlink(missing_ok=True)
+
+    if base_rss is None or file_rss is None:
+        return 1
+
+    growth = file_rss - base_rss
+    print(
+        f"RSS growth : {growth:+.0f} MB over the 1 MB run "
+        f"(limit {args.max_rss_growth_mb:.0f} MB)"
+    )
+    return 0 if growth <= args.max_rss_growth_mb else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Measure the overhead of runtime metrics collection on scrub time.
+
+Scrubs the same corpus with metrics enabled and disabled, alternating rounds
+to cancel out drift, and fails if the overhead exceeds the threshold.
+Requires the spaCy model(s) from the config to be installed.
+
+Usage:
+
+    python benchmarks/bench_metrics.py [--config path] [--rounds 5] [--max-overhead 0.01]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from scrub import Config, TextScrubber
+
+SAMPLES = [
+    "Hi, I'm Jane Smith from Acme Corp. Email me at jane.smith@acme.com or call 07700 900123.\n",
+    "2024-05-01T12:00:01Z INFO handled GET /api/v1/items in 12ms status=200 host=10.0.0.12\n",
+    "def load(path):\n    with open(path) as f:\n        return json.load(f)\n",
+    "Credit card: 4532-1488-0343-6467, meeting with Oliver Brown in London on Friday.\n",
+]
+
+
+def scrub_all(scrubber: TextScrubber, docs) -> float:
+    """Scrub every doc; return total seconds."""
+    start = time.perf_counter()
+    for doc in docs:
+        scrubber.scrub(doc)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", type=Path, default=None)
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-overhead", type=float, default=0.01)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    docs = ["".join(rng.choices(SAMPLES, k=rng.randint(1, 20))) for _ in range(args.docs)]
+
+    scrubbers = {}
+    for enabled in (False, True):
+        cfg = Config.load(args.config)
+        cfg.metrics_enabled = enabled
+        # Measure collection only; exporting runs on a background thread
+        cfg.metrics_path = cfg.metrics_socket = None
+        scrubbers[enabled] = TextScrubber(config=cfg)
+        scrub_all(scrubbers[enabled], docs[:5])  # load models before timing
+
+    totals = {False: 0.0, True: 0.0}
+    for _ in range(args.rounds):
+        for enabled in (False, True):
+            totals[enabled] += scrub_all(scrubbers[enabled], docs)
+
+    overhead = totals[True] / totals[False] - 1
+    print(f"metrics off: {totals[False]:8.2f}s")
+    print(f"metrics on : {totals[True]:8.2f}s")
+    print(f"overhead   : {overhead:+.2%} (limit {args.max_overhead:.0%})")
+
+    return 0 if overhead <= args.max_overhead else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
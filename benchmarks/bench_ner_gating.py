@@ -0,0 +1,120 @@
+"""
+Compare context-gated NER against full NER on a synthetic paste corpus.
+
+Reports analysis time, how many of the full-NER findings gated analysis keeps
+and how often it fell back to full NER, for several ner_window settings.
+Requires the spaCy model(s) from the config to be installed.
+
+Usage:
+
+    python benchmarks/bench_ner_gating.py [--config path] [--docs 200] [--windows 50,100,200]
+        [--max-coverage 0.5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from scrub import Config, TextScrubber
+
+FIRST = ["Jane", "John", "Priya", "Wei", "Fatima", "Oliver", "Sofia", "Liam"]
+LAST = ["Smith", "Patel", "Chen", "Okafor", "García", "Brown", "Nowak", "Kim"]
+CITIES = ["London", "Manchester", "Berlin", "Toronto", "Sydney", "Dublin"]
+
+CODE = [
+    "def load(path):\n    with open(path) as f:\n        return json.load(f)\n",
+    "for i in range(len(items)):\n    total += items[i].price * qty\n",
+    "if (err != nil) { return fmt.Errorf(\"read: %w\", err) }\n",
+]
+LOGS = [
+    "2024-05-01T12:00:01Z INFO handled GET /api/v1/items in 12ms status=200\n",
+    "2024-05-01T12:00:02Z WARN retrying upstream=payments attempt=2\n",
+    "2024-05-01T12:00:03Z ERROR timeout after 3000ms host=10.0.0.12\n",
+]
+PROSE = [
+    "Please contact {name} about the rollout before Friday.\n",
+    "{name} from the {city} office will call you on 07700 900{n:03d}.\n",
+    "The meeting with {name} moved to next week; phone {name2} if urgent.\n",
+]
+
+
+def make_doc(rng: random.Random) -> str:
+    """Build one paste: mostly code and logs, with a little prose."""
+    parts = []
+    for _ in range(rng.randint(20, 60)):
+        kind = rng.random()
+        if kind < 0.45:
+            parts.append(rng.choice(CODE))
+        elif kind < 0.9:
+            parts.append(rng.choice(LOGS))
+        else:
+            parts.append(
+                rng.choice(PROSE).format(
+                    name=f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                    name2=f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                    city=rng.choice(CITIES),
+                    n=rng.randint(0, 999),
+                )
+            )
+    return "".join(parts)
+
+
+def run(scrubber: TextScrubber, docs) -> tuple:
+    """Analyze every doc; return total seconds and the set of findings."""
+    findings = set()
+    start = time.perf_counter()
+    for i, doc in enumerate(docs):
+        for result in scrubber.analyze(doc):
+            findings.add((i, result.start, result.end, result.entity_type))
+    return time.perf_counter() - start, findings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", type=Path, default=None)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--windows", default="50,100,200")
+    parser.add_argument("--max-coverage", type=float, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    docs = [make_doc(rng) for _ in range(args.docs)]
+    chars = sum(len(d) for d in docs)
+    print(f"corpus: {len(docs)} docs, {chars} chars")
+
+    cfg = Config.load(args.config)
+    cfg.ner_gating = False
+    full = TextScrubber(config=cfg)
+    full.analyze(docs[0])  # load models before timing
+    full_time, full_found = run(full, docs)
+    print(f"full NER     : {full_time:7.2f}s  {len(full_found)} findings")
+
+    for window in (int(w) for w in args.windows.split(",")):
+        cfg = Config.load(args.config)
+        cfg.ner_gating = True
+        cfg.ner_window = window
+        if args.max_coverage is not None:
+            cfg.ner_max_coverage = args.max_coverage
+        gated = TextScrubber(config=cfg)
+        gated.analyze(docs[0])
+        gated.gated_runs = gated.gating_fallbacks = 0
+        gated_time, gated_found = run(gated, docs)
+        fallback = gated.gating_fallbacks / gated.gated_runs if gated.gated_runs else 0.0
+
+        kept = full_found & gated_found
+        missed = Counter(entity for *_, entity in full_found - gated_found)
+        recall = len(kept) / len(full_found) if full_found else 1.0
+        print(
+            f"gated w={window:<4}: {gated_time:7.2f}s  {full_time / gated_time:5.2f}x faster  "
+            f"recall {recall:6.1%}  fallback {fallback:6.1%}  "
+            f"extra {len(gated_found - full_found)}  missed {dict(missed) or '-'}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
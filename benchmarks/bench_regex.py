@@ -0,0 +1,95 @@
+"""
+Worst-case latency benchmark for the custom pattern recognizers.
+
+Runs each recognizer against fuzzed and adversarial inputs of doubling size and
+checks that time per character stays flat, i.e. matching is linear in input length.
+
+Usage:
+
+    python benchmarks/bench_regex.py [--max-size 1000000] [--tolerance 4.0]
+"""
+
+import argparse
+import random
+import string
+import sys
+import time
+
+from scrub.recognizers import (
+    CorporateNameRecognizer,
+    DenyListRecognizer,
+    DomainRecognizer,
+    UKPhoneRecognizer,
+)
+
+RECOGNIZERS = {
+    "uk_phone": UKPhoneRecognizer(regex_timeout=60.0),
+    "domain": DomainRecognizer(domains=["internal.example.io"], regex_timeout=60.0),
+    "corporate": CorporateNameRecognizer(company_names=["Example Corp"], regex_timeout=60.0),
+    "denylist": DenyListRecognizer(deny_list=["internal-tool-v2"], regex_timeout=60.0),
+}
+
+
+def adversarial_inputs(size: int) -> dict:
+    """Build inputs that stress backtracking engines, each ``size`` chars long."""
+    return {
+        "digit_run": "0" * size,
+        "spaced_digits": ("07" + "1 " * (size // 2))[:size],
+        "plus44_run": ("+44 " * (size // 4 + 1))[:size],
+        "url_single_token": ("https://internal.example.io/" + "a" * size)[:size],
+        "no_space_line": ("x" * size),
+        "fuzz": "".join(
+            random.choice(string.digits + " +-()/:." + string.ascii_letters) for _ in range(size)
+        ),
+    }
+
+
+def time_call(recognizer, text: str) -> float:
+    """Return seconds taken for one analyze() call."""
+    start = time.perf_counter()
+    recognizer.analyze(text=text, entities=recognizer.supported_entities)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--min-size", type=int, default=10_000)
+    parser.add_argument("--max-size", type=int, default=1_000_000)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=4.0,
+        help="Max allowed growth of time-per-char from smallest to largest input.",
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    engines = {
+        p.compiled_regex.engine for r in RECOGNIZERS.values() for p in r.patterns
+    }
+    print(f"engines in use: {', '.join(sorted(engines))}")
+
+    failures = 0
+    for rec_name, recognizer in RECOGNIZERS.items():
+        for input_name in adversarial_inputs(0):
+            per_char = []
+            size = args.min_size
+            while size <= args.max_size:
+                text = adversarial_inputs(size)[input_name]
+                per_char.append(time_call(recognizer, text) / size)
+                size *= 2
+
+            growth = per_char[-1] / max(per_char[0], 1e-12)
+            worst_ms = per_char[-1] * (size // 2) * 1000
+            status = "ok" if growth <= args.tolerance else "NONLINEAR"
+            failures += status != "ok"
+            print(
+                f"{rec_name:10} {input_name:18} worst={worst_ms:9.2f}ms "
+                f"growth={growth:5.2f}x  {status}"
+            )
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
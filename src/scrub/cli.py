@@ -1,6 +1,7 @@
 """Command-line interface for scrub tool."""
 
 import sys
+import time
 from pathlib import Path
 
 import click
@@ -8,10 +9,12 @@ import click
 from . import __version__
 from .clipboard import ClipboardError, read_clipboard, write_clipboard
 from .config import Config, create_example_config, get_default_config_path
+from .files import DEFAULT_WINDOW_SIZE, MAX_WINDOW_SIZE, scrub_file
+from .metrics import histogram_from_samples, parse_prometheus, read_metrics
 from .scrubber import TextScrubber
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--stdin",
     is_flag=True,
@@ -27,13 +30,25 @@ from .scrubber import TextScrubber
     type=click.Path(exists=True, path_type=Path),
     help="Path to config file (default: ~/.config/scrub/config.yaml).",
 )
+@click.option(
+    "--language",
+    help="Language code of the input (default: detected from the text).",
+)
 @click.option(
     "--init-config",
     is_flag=True,
     help="Create example config file at default location.",
 )
 @click.version_option(version=__version__, prog_name="scrub")
-def main(stdin: bool, dry_run: bool, config: Path, init_config: bool):
+@click.pass_context
+def main(
+    ctx: click.Context,
+    stdin: bool,
+    dry_run: bool,
+    config: Path,
+    language: str,
+    init_config: bool,
+):
     """
     Scrub PII and corporate information from clipboard or stdin.
     
@@ -47,8 +62,29 @@ def main(stdin: bool, dry_run: bool, config: Path, init_config: bool):
         
         scrub --dry-run          # Show what would be redacted
         
+        scrub --language de      # Scrub German text
+        
         scrub --init-config      # Create example config file
+        
+        scrub file big.log       # Scrub a file in place
+        
+        scrub stats              # Show runtime metrics
     """
+    # A subcommand (e.g. "scrub file") handles its own work, with the group's
+    # --config and --language as defaults for its own options
+    if ctx.invoked_subcommand is not None:
+        for flag, value in (
+            ("--stdin", stdin),
+            ("--dry-run", dry_run),
+            ("--init-config", init_config),
+        ):
+            if value:
+                raise click.UsageError(
+                    f"{flag} cannot be used with the '{ctx.invoked_subcommand}' command."
+                )
+        ctx.obj = {"config": config, "language": language}
+        return
+    
     try:
         # Handle init-config flag
         if init_config:
@@ -87,7 +123,7 @@ def main(stdin: bool, dry_run: bool, config: Path, init_config: bool):
         
         # Dry-run mode: show what would be detected
         if dry_run:
-            results = scrubber.analyze(text)
+            results = scrubber.analyze(text, language=language)
             
             if not results:
                 click.echo("No PII or sensitive information detected.", err=True)
@@ -104,7 +140,7 @@ def main(stdin: bool, dry_run: bool, config: Path, init_config: bool):
             sys.exit(0)
         
         # Scrub the text
-        scrubbed_text = scrubber.scrub(text)
+        scrubbed_text = scrubber.scrub(text, language=language)
         
         # Output
         if stdin:
@@ -128,5 +164,184 @@ def main(stdin: bool, dry_run: bool, config: Path, init_config: bool):
         sys.exit(1)
 
 
+@main.command("file")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write scrubbed output here instead of replacing PATH.",
+)
+@click.option(
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    help="Path to config file (default: ~/.config/scrub/config.yaml).",
+)
+@click.option(
+    "--language",
+    help="Language code of the input (default: detected per window).",
+)
+@click.option(
+    "--window-size",
+    type=click.IntRange(min=1024, max=MAX_WINDOW_SIZE),
+    default=DEFAULT_WINDOW_SIZE,
+    show_default=True,
+    help="Bytes analyzed at a time.",
+)
+@click.pass_context
+def file_command(
+    ctx: click.Context,
+    path: Path,
+    output: Path,
+    config: Path,
+    language: str,
+    window_size: int,
+):
+    """
+    Scrub a file in place, or into --output, without loading it into memory.
+    
+    The file is memory-mapped and scrubbed window by window. Output goes to a
+    temporary file that is atomically renamed over the destination, so the
+    original is never left half-written.
+    
+    Examples:
+    
+        scrub file app.log                   # Replace app.log with scrubbed copy
+        
+        scrub file dump.txt -o clean.txt     # Leave dump.txt untouched
+    """
+    config = config or ctx.obj["config"]
+    language = language or ctx.obj["language"]
+    
+    try:
+        cfg = Config.load(config)
+        scrubber = TextScrubber(config=cfg)
+        
+        redacted = scrub_file(
+            scrubber,
+            path,
+            output_path=output,
+            language=language,
+            window_size=window_size,
+        )
+        click.echo(f"Redacted {redacted} item(s) in {output or path}", err=True)
+    
+    except KeyboardInterrupt:
+        click.echo("\nAborted.", err=True)
+        sys.exit(130)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@main.command("stats")
+@click.option(
+    "--config",
+    type=click.Path(exists=True, path_type=Path),
+    help="Path to config file (default: ~/.config/scrub/config.yaml).",
+)
+@click.option(
+    "--raw",
+    is_flag=True,
+    help="Print the metrics in Prometheus text format.",
+)
+@click.pass_context
+def stats_command(ctx: click.Context, config: Path, raw: bool):
+    """
+    Show metrics exported by scrub (see 'metrics' in the config file).
+    
+    Reads the metrics socket of a running scrub process if one is
+    configured and being served, otherwise the metrics file.
+    """
+    if ctx.obj["language"]:
+        raise click.UsageError("--language cannot be used with the 'stats' command.")
+    config = config or ctx.obj["config"]
+    
+    try:
+        cfg = Config.load(config)
+        if not (cfg.metrics_path or cfg.metrics_socket):
+            click.echo(
+                "Metrics export is not configured. Set 'metrics.path' or "
+                "'metrics.socket' in the config file.",
+                err=True,
+            )
+            sys.exit(1)
+        
+        try:
+            text = read_metrics(path=cfg.metrics_path, socket_path=cfg.metrics_socket)
+        except OSError as e:
+            click.echo(f"Error reading metrics: {e}", err=True)
+            sys.exit(1)
+        
+        if raw:
+            click.echo(text, nl=False)
+            sys.exit(0)
+        
+        samples = parse_prometheus(text)
+        
+        def single(name: str) -> float:
+            return samples.get(name, {}).get((), 0.0)
+        
+        def labelled(name: str) -> list:
+            values = [(dict(labels), value) for labels, value in samples.get(name, {}).items()]
+            return sorted(values, key=lambda item: item[1], reverse=True)
+        
+        started = single("scrub_start_time_seconds")
+        if started:
+            click.echo(f"Since {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started))}")
+        
+        for label, name in (
+            ("Analyze", "scrub_analyze_seconds"),
+            ("Anonymize", "scrub_anonymize_seconds"),
+        ):
+            histogram = histogram_from_samples(samples, name)
+            mean = histogram.sum / histogram.count if histogram.count else 0.0
+            click.echo(
+                f"{label + ':':11}{histogram.count:8d} calls  "
+                f"mean {mean * 1000:8.1f} ms  "
+                f"p50 ~{histogram.quantile(0.5) * 1000:8.1f} ms  "
+                f"p95 ~{histogram.quantile(0.95) * 1000:8.1f} ms"
+            )
+        
+        click.echo(
+            f"Throughput: {single('scrub_throughput_bytes_per_second') / 1024:.1f} KB/s "
+            f"over {single('scrub_bytes_total') / (1024 * 1024):.2f} MB"
+        )
+        
+        hits = sum(samples.get("scrub_cache_hits_total", {}).values())
+        misses = sum(samples.get("scrub_cache_misses_total", {}).values())
+        if hits + misses:
+            click.echo(
+                f"Model cache: {hits / (hits + misses):.1%} hit ratio "
+                f"({int(hits + misses)} lookups)"
+            )
+        
+        entities = labelled("scrub_entities_total")
+        if entities:
+            click.echo("Entities:")
+            for labels, count in entities:
+                click.echo(f"  {labels['entity_type']:30} {int(count):8d}")
+        
+        calls = {
+            labels["recognizer"]: count
+            for labels, count in labelled("scrub_recognizer_calls_total")
+        }
+        recognizers = labelled("scrub_recognizer_seconds_total")
+        if recognizers:
+            click.echo("Recognizer time:")
+            for labels, seconds in recognizers:
+                name = labels["recognizer"]
+                click.echo(
+                    f"  {name:30} {seconds:8.3f} s  ({int(calls.get(name, 0))} calls)"
+                )
+    
+    except KeyboardInterrupt:
+        click.echo("\nAborted.", err=True)
+        sys.exit(130)
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -6,6 +6,8 @@ from typing import Dict, List, Optional
 
 import yaml
 
+from .gating import DEFAULT_NER_WINDOW, MAX_GATED_COVERAGE
+
 
 class Config:
     """Configuration for scrub tool."""
@@ -16,6 +18,18 @@ class Config:
         domains: Optional[List[str]] = None,
         project_names: Optional[List[str]] = None,
         deny_list: Optional[List[str]] = None,
+        regex_timeout: float = 1.0,
+        models: Optional[Dict[str, str]] = None,
+        default_language: Optional[str] = None,
+        max_models: int = 2,
+        memory_limit_mb: Optional[float] = None,
+        ner_gating: bool = False,
+        ner_window: int = DEFAULT_NER_WINDOW,
+        ner_max_coverage: float = MAX_GATED_COVERAGE,
+        metrics_enabled: bool = True,
+        metrics_path: Optional[str] = None,
+        metrics_socket: Optional[str] = None,
+        metrics_interval: float = 15.0,
     ):
         """
         Initialize configuration.
@@ -25,11 +39,44 @@ class Config:
             domains: List of internal domains/URLs to redact.
             project_names: List of project/product names to redact.
             deny_list: List of custom terms to redact.
+            regex_timeout: Time budget in seconds for each custom pattern on each input.
+            models: Mapping of language code to spaCy model name.
+            default_language: Language used when detection is inconclusive. Defaults
+                to "en" if configured, otherwise the first configured model.
+            max_models: Maximum number of language models held in memory at once.
+            memory_limit_mb: Ceiling on the total estimated size of loaded models.
+            ner_gating: Run NER only around likely entities instead of on all text.
+            ner_window: Characters of context NER sees around each candidate.
+            ner_max_coverage: Share of the text above which gated NER falls back
+                to analyzing all of it.
+            metrics_enabled: Collect latency, throughput and hit-count metrics.
+            metrics_path: File metrics are periodically written to.
+            metrics_socket: Unix socket metrics are served on.
+            metrics_interval: Seconds between metric file dumps.
         """
         self.company_names = company_names or []
         self.domains = domains or []
         self.project_names = project_names or []
         self.deny_list = deny_list or []
+        self.regex_timeout = regex_timeout
+        self.models = models or {"en": "en_core_web_lg"}
+        self.default_language = default_language or (
+            "en" if "en" in self.models else next(iter(self.models))
+        )
+        if self.default_language not in self.models:
+            raise ValueError(
+                f"Default language '{self.default_language}' has no model configured "
+                f"(configured: {', '.join(self.models)})"
+            )
+        self.max_models = max_models
+        self.memory_limit_mb = memory_limit_mb
+        self.ner_gating = ner_gating
+        self.ner_window = ner_window
+        self.ner_max_coverage = ner_max_coverage
+        self.metrics_enabled = metrics_enabled
+        self.metrics_path = metrics_path
+        self.metrics_socket = metrics_socket
+        self.metrics_interval = metrics_interval
     
     @classmethod
     def load(cls, config_path: Optional[Path] = None) -> "Config":
@@ -54,12 +101,27 @@ class Config:
                 data = yaml.safe_load(f) or {}
             
             corporate = data.get("corporate", {})
+            performance = data.get("performance", {})
+            languages = data.get("languages", {})
+            metrics = data.get("metrics", {})
             
             return cls(
                 company_names=corporate.get("company_names", []),
                 domains=corporate.get("domains", []),
                 project_names=corporate.get("project_names", []),
                 deny_list=corporate.get("deny_list", []),
+                regex_timeout=float(performance.get("regex_timeout", 1.0)),
+                ner_gating=bool(performance.get("ner_gating", False)),
+                ner_window=int(performance.get("ner_window", DEFAULT_NER_WINDOW)),
+                ner_max_coverage=float(performance.get("ner_max_coverage", MAX_GATED_COVERAGE)),
+                models=languages.get("models"),
+                default_language=languages.get("default"),
+                max_models=int(languages.get("max_models", 2)),
+                memory_limit_mb=languages.get("memory_limit_mb"),
+                metrics_enabled=bool(metrics.get("enabled", True)),
+                metrics_path=metrics.get("path"),
+                metrics_socket=metrics.get("socket"),
+                metrics_interval=float(metrics.get("interval", 15.0)),
             )
         except yaml.YAMLError as e:
             raise ValueError(f"Failed to parse config file: {e}") from e
@@ -74,7 +136,25 @@ class Config:
                 "domains": self.domains,
                 "project_names": self.project_names,
                 "deny_list": self.deny_list,
-            }
+            },
+            "performance": {
+                "regex_timeout": self.regex_timeout,
+                "ner_gating": self.ner_gating,
+                "ner_window": self.ner_window,
+                "ner_max_coverage": self.ner_max_coverage,
+            },
+            "languages": {
+                "default": self.default_language,
+                "max_models": self.max_models,
+                "memory_limit_mb": self.memory_limit_mb,
+                "models": self.models,
+            },
+            "metrics": {
+                "enabled": self.metrics_enabled,
+                "path": self.metrics_path,
+                "socket": self.metrics_socket,
+                "interval": self.metrics_interval,
+            },
         }
 
 
@@ -129,7 +209,25 @@ def create_example_config(output_path: Optional[Path] = None) -> None:
                 "confidential-system-name",
                 "internal-tool-v2",
             ],
-        }
+        },
+        "performance": {
+            "regex_timeout": 1.0,
+            "ner_gating": False,
+            "ner_window": DEFAULT_NER_WINDOW,
+            "ner_max_coverage": MAX_GATED_COVERAGE,
+        },
+        "languages": {
+            "default": "en",
+            "max_models": 2,
+            "models": {
+                "en": "en_core_web_lg",
+            },
+        },
+        "metrics": {
+            "enabled": True,
+            "path": "~/.config/scrub/metrics.prom",
+            "interval": 15.0,
+        },
     }
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
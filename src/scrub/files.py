@@ -0,0 +1,326 @@
+"""Windowed, memory-mapped scrubbing of files too large to hold in memory."""
+
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Bytes analyzed per window; kept well under spaCy's default max_length
+DEFAULT_WINDOW_SIZE = 256 * 1024
+
+# Largest window size accepted. Analyzed text can reach three times the window
+# size (line extension plus carried-over text), which must stay under spaCy's
+# default max_length of 1,000,000 characters.
+MAX_WINDOW_SIZE = 320 * 1024
+
+# Bytes at the end of each window that are only committed with the next window,
+# so entities crossing a window edge are analyzed whole
+WINDOW_OVERLAP = 4 * 1024
+
+# Size of the buffered writer used for output
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+_ENCODING = "utf-8"
+# Undecodable bytes survive as lone surrogates, so offsets still map 1:1 to bytes
+_ERRORS = "surrogateescape"
+
+_SPACES_ONLY = re.compile(r" +")
+
+# Pages of the mapping are dropped once written so RSS stays bounded (not on Windows)
+_CAN_RELEASE_PAGES = hasattr(mmap, "MADV_DONTNEED")
+
+Span = Tuple[int, int, str]
+
+
+def iter_windows(buffer, window_size: int = DEFAULT_WINDOW_SIZE) -> Iterator[Tuple[int, int]]:
+    """
+    Split a byte buffer into windows that end on a line break where possible.
+
+    A window is extended up to another window_size bytes to reach a newline, then
+    falls back to the last whitespace, then to the nearest UTF-8 character boundary,
+    so no window ever ends inside a multi-byte character.
+
+    Args:
+        buffer: Bytes-like object supporting find/rfind (e.g. an mmap).
+        window_size: Target window size in bytes.
+
+    Yields:
+        Tuple[int, int]: Start and end byte offsets of each window.
+    """
+    size = len(buffer)
+    start = 0
+    while start < size:
+        end = start + window_size
+        if end >= size:
+            yield start, size
+            return
+
+        limit = min(end + window_size, size)
+        newline = buffer.find(b"\n", end, limit)
+        if newline != -1:
+            end = newline + 1
+        else:
+            space = max(buffer.rfind(b" ", start, end), buffer.rfind(b"\t", start, end))
+            if space > start:
+                end = space + 1
+            else:
+                # Back up over UTF-8 continuation bytes (0b10xxxxxx)
+                while end > start + 1 and buffer[end] & 0xC0 == 0x80:
+                    end -= 1
+
+        yield start, end
+        start = end
+
+
+def resolve_spans(results: List) -> List[Span]:
+    """
+    Reduce analyzer results to sorted, non-overlapping (start, end, entity_type) spans.
+
+    Mirrors the anonymizer's defaults: overlapping results of the same type are
+    merged, results contained in another are dropped, and where different types
+    partially overlap the higher-scoring one keeps the shared characters.
+
+    Args:
+        results: RecognizerResult objects from the analyzer.
+
+    Returns:
+        List[Span]: Spans ordered by start offset.
+    """
+    ordered = sorted(results, key=lambda r: (r.start, -r.end, -r.score))
+    spans: List[List] = []
+    for result in ordered:
+        start, end, entity_type, score = result.start, result.end, result.entity_type, result.score
+        if spans and start < spans[-1][1]:
+            prev = spans[-1]
+            if prev[2] == entity_type:
+                prev[1] = max(prev[1], end)
+                prev[3] = max(prev[3], score)
+                continue
+            if end <= prev[1]:
+                # Contained in the previous span
+                continue
+            if score > prev[3]:
+                prev[1] = start
+            else:
+                start = prev[1]
+        spans.append([start, end, entity_type, score])
+
+    return [(start, end, entity_type) for start, end, entity_type, _ in spans]
+
+
+def _merge_space_separated(text: str, spans: List[Span]) -> List[Span]:
+    """Merge adjacent spans of the same type separated only by spaces."""
+    merged: List[Span] = []
+    for span in spans:
+        if merged:
+            prev = merged[-1]
+            if prev[2] == span[2] and _SPACES_ONLY.fullmatch(text, prev[1], span[0]):
+                merged[-1] = (prev[0], span[1], span[2])
+                continue
+        merged.append(span)
+    return merged
+
+
+def _to_byte_spans(text: str, spans: List[Span], single_byte: bool) -> List[Span]:
+    """Convert character offsets within text into byte offsets of its UTF-8 encoding."""
+    if single_byte:
+        return spans
+
+    byte_spans = []
+    char_pos = byte_pos = 0
+    for start, end, entity_type in spans:
+        byte_pos += len(text[char_pos:start].encode(_ENCODING, _ERRORS))
+        byte_start = byte_pos
+        byte_pos += len(text[start:end].encode(_ENCODING, _ERRORS))
+        byte_spans.append((byte_start, byte_pos, entity_type))
+        char_pos = end
+    return byte_spans
+
+
+def scrub_file(
+    scrubber,
+    input_path: Path,
+    output_path: Optional[Path] = None,
+    language: Optional[str] = None,
+    window_size: int = DEFAULT_WINDOW_SIZE,
+) -> int:
+    """
+    Scrub a file window by window without loading it into memory.
+
+    The input is memory-mapped; each window is decoded and analyzed, and the output
+    is written from the original bytes plus ``<ENTITY_TYPE>`` labels to a temporary
+    file that is atomically renamed over output_path. Passing no output_path (or the
+    input path) replaces the input file safely.
+
+    Args:
+        scrubber: TextScrubber used to analyze each window.
+        input_path: File to scrub.
+        output_path: Destination file (default: replace input_path).
+        language: Language code. Detected per window if not given.
+        window_size: Target window size in bytes, at most MAX_WINDOW_SIZE.
+
+    Returns:
+        int: Number of entities redacted.
+
+    Raises:
+        ValueError: If window_size exceeds MAX_WINDOW_SIZE.
+    """
+    if window_size > MAX_WINDOW_SIZE:
+        raise ValueError(f"Window size {window_size} exceeds the maximum of {MAX_WINDOW_SIZE}")
+
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path else input_path
+
+    fd, tmp_name = tempfile.mkstemp(
+        dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp"
+    )
+    redacted = 0
+    try:
+        with open(input_path, "rb") as src, os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE) as out:
+            if os.fstat(src.fileno()).st_size > 0:
+                with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    redacted = _scrub_mapped(scrubber, mm, out, language, window_size)
+            out.flush()
+            os.fsync(out.fileno())
+
+        shutil.copymode(input_path, tmp_name)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    return redacted
+
+
+def _scrub_mapped(scrubber, mm: mmap.mmap, out, language: Optional[str], window_size: int) -> int:
+    """
+    Analyze each window of a mapped file and write the scrubbed bytes to out.
+
+    Each window is analyzed together with the text carried over from the previous
+    one. Only the text before the window's last overlap bytes is written; the rest
+    is carried into the next window, so an entity crossing a window edge is always
+    analyzed whole.
+    """
+    size = len(mm)
+    overlap = min(WINDOW_OVERLAP, window_size // 4)
+    metrics = getattr(scrubber, "metrics", None)
+    redacted = 0
+    pos = 0  # Everything before pos has been written
+    released = 0
+    view = memoryview(mm)
+    try:
+        for _, end in iter_windows(mm, window_size):
+            with view[pos:end] as chunk:
+                text = str(chunk, _ENCODING, _ERRORS)
+
+                spans = resolve_spans(scrubber.analyze(text, language=language))
+                spans = _merge_space_separated(text, spans)
+                # One char per byte means char offsets are already byte offsets
+                spans = _to_byte_spans(text, spans, len(text) == end - pos)
+
+                if end == size:
+                    cut = end - pos
+                else:
+                    cut = _boundary_before(mm, pos, end - overlap) - pos
+                    cut, spans = _commit_spans(spans, cut, len(chunk) - window_size)
+
+                # Copy unchanged bytes straight from the mapping, labels in between
+                written = 0
+                for span_start, span_end, entity_type in spans:
+                    out.write(chunk[written:span_start])
+                    out.write(f"<{entity_type}>".encode(_ENCODING))
+                    written = span_end
+                out.write(chunk[written:cut])
+                redacted += len(spans)
+                if metrics is not None:
+                    metrics.observe_redactions(entity_type for *_, entity_type in spans)
+
+            pos += cut
+            if _CAN_RELEASE_PAGES:
+                released = _release_pages(mm, released, pos)
+    finally:
+        view.release()
+
+    return redacted
+
+
+def _boundary_before(buffer, start: int, end: int) -> int:
+    """
+    Return the offset just after the last whitespace in buffer[start:end].
+
+    Falls back to the nearest UTF-8 character boundary at or before end, and to
+    start if end is not after it.
+    """
+    if end <= start:
+        return start
+
+    space = max(
+        buffer.rfind(b"\n", start, end),
+        buffer.rfind(b" ", start, end),
+        buffer.rfind(b"\t", start, end),
+    )
+    if space != -1:
+        return space + 1
+
+    # Back up over UTF-8 continuation bytes (0b10xxxxxx)
+    while end > start and buffer[end] & 0xC0 == 0x80:
+        end -= 1
+    return end
+
+
+def _commit_spans(spans: List[Span], cut: int, min_carry_start: int) -> Tuple[int, List[Span]]:
+    """
+    Move a cut off any span crossing it and return the spans before the cut.
+
+    A crossing span is left for the next window by moving the cut back to its
+    start, unless that would carry more than a window (its start is before
+    min_carry_start) or make no progress; then the cut moves past the span.
+
+    Args:
+        spans: Sorted, non-overlapping byte spans relative to the analyzed text.
+        cut: Proposed end of the text to write now.
+        min_carry_start: Earliest offset the carried-over text may start at.
+
+    Returns:
+        Tuple[int, List[Span]]: The final cut and the spans ending at or before it.
+    """
+    committed = []
+    for span in spans:
+        start, end, _ = span
+        if end <= cut:
+            committed.append(span)
+            continue
+        if start < cut:
+            if start > 0 and start >= min_carry_start:
+                cut = start
+            else:
+                cut = end
+                committed.append(span)
+        break
+    return cut, committed
+
+
+def _release_pages(mm: mmap.mmap, start: int, end: int) -> int:
+    """
+    Drop the whole pages of a read-only mapping between start and end from memory.
+
+    Read-only file pages are reloaded from disk if touched again, so this only
+    keeps them from accumulating in the resident set while a large file is read.
+
+    Args:
+        mm: Mapping to release pages of.
+        start: Page-aligned offset of the first byte not yet released.
+        end: Offset up to which the mapping is no longer needed.
+
+    Returns:
+        int: Page-aligned offset of the first byte still held.
+    """
+    aligned_end = end - end % mmap.PAGESIZE
+    if aligned_end > start:
+        mm.madvise(mmap.MADV_DONTNEED, start, aligned_end - start)
+        return aligned_end
+    return start
@@ -0,0 +1,107 @@
+"""Cheap pre-scan that limits NER to the regions of text likely to need it."""
+
+import re
+from typing import Iterable, List, Tuple
+
+# Characters of text kept on each side of a candidate; larger means better recall
+DEFAULT_NER_WINDOW = 100
+
+# Above this share of the text, gating saves too little and NER runs on everything
+MAX_GATED_COVERAGE = 0.5
+
+# Furthest a window edge moves to reach whitespace, so a word is not cut in half
+MAX_TOKEN_WIDENING = 32
+
+# A capitalized word (Latin-1 letters), not part of a CamelCase identifier, an
+# attribute access or a call (e.g. "fmt.Errorf(")
+_CAPITALIZED_RE = re.compile(r"(?<![\w.])[A-ZÀ-ÖØ-Þ][a-zß-öø-ÿ]+\b(?!\()")
+
+Window = Tuple[int, int]
+
+
+class CandidateScanner:
+    """
+    Finds the windows of a text where named entities may appear.
+
+    Candidates are capitalized words and the context words declared by the
+    registered recognizers (e.g. "company", "phone", "contact"). Each candidate
+    is padded by a fixed number of characters and overlapping windows are merged.
+    """
+
+    def __init__(self, context_words: Iterable[str], padding: int = DEFAULT_NER_WINDOW):
+        """
+        Initialize the scanner.
+
+        Args:
+            context_words: Words that suggest a nearby entity.
+            padding: Characters kept on each side of every candidate.
+        """
+        self.padding = padding
+
+        words = sorted({w.lower() for w in context_words if w}, key=len, reverse=True)
+        self._context_re = (
+            re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE)
+            if words
+            else None
+        )
+
+    def windows(self, text: str) -> List[Window]:
+        """
+        Return merged (start, end) windows around every candidate in text.
+
+        Window edges are moved out to the nearest whitespace, at most
+        MAX_TOKEN_WIDENING characters, so words are not cut in half.
+
+        Args:
+            text: Text to scan.
+
+        Returns:
+            List[Window]: Non-overlapping windows ordered by start offset.
+        """
+        spans = [m.span() for m in _CAPITALIZED_RE.finditer(text)]
+        if self._context_re is not None:
+            spans.extend(m.span() for m in self._context_re.finditer(text))
+        spans.sort()
+
+        windows: List[List[int]] = []
+        for start, end in spans:
+            start = _widen_start(text, max(0, start - self.padding))
+            end = _widen_end(text, min(len(text), end + self.padding))
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+
+        return [(start, end) for start, end in windows]
+
+
+def _widen_start(text: str, pos: int) -> int:
+    """Move pos back to just after the previous whitespace, within MAX_TOKEN_WIDENING."""
+    limit = max(0, pos - MAX_TOKEN_WIDENING)
+    while pos > limit and not text[pos - 1].isspace():
+        pos -= 1
+    return pos
+
+
+def _widen_end(text: str, pos: int) -> int:
+    """Move pos forward to the next whitespace, within MAX_TOKEN_WIDENING."""
+    limit = min(len(text), pos + MAX_TOKEN_WIDENING)
+    while pos < limit and not text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def coverage(windows: List[Window], length: int) -> float:
+    """
+    Share of a text of the given length covered by windows.
+
+    Args:
+        windows: Non-overlapping (start, end) windows.
+        length: Length of the text.
+
+    Returns:
+        float: Covered fraction between 0 and 1.
+    """
+    if length == 0:
+        return 0.0
+    return sum(end - start for start, end in windows) / length
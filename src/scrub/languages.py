@@ -0,0 +1,190 @@
+"""Language detection and lazily loaded per-language engines."""
+
+import gc
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+logger = logging.getLogger("scrub")
+
+T = TypeVar("T")
+
+# Frequent function words per language; enough to tell these languages apart
+STOPWORDS: Dict[str, frozenset] = {
+    "en": frozenset(
+        "the and of to in is that it for was with as on are be this have from or "
+        "by not but at we you they he she will would can an".split()
+    ),
+    "de": frozenset(
+        "der die das und ist nicht ein eine zu den von mit sich des auf für im "
+        "dem auch es an wird sie wir ich bei oder aber".split()
+    ),
+    "fr": frozenset(
+        "le la les et est des un une du dans en que qui pour pas sur au avec ce "
+        "il elle nous vous sont par ou mais".split()
+    ),
+    "es": frozenset(
+        "el la los las y es de que en un una por con para no se del al lo como "
+        "su más pero sus le ya está son".split()
+    ),
+    "it": frozenset(
+        "il lo la gli le e è di che un una per con non si del della sono anche "
+        "come ma più alla nel questo".split()
+    ),
+    "nl": frozenset(
+        "de het een en is van dat niet in op te met voor zijn er ook aan maar "
+        "bij om als dan wordt".split()
+    ),
+    "pt": frozenset(
+        "o a os as e é de que em um uma para com não se do da no na por mais "
+        "mas como são foi seu".split()
+    ),
+}
+
+# Only the start of the input is sampled; enough words to decide, cheap on huge pastes
+DETECTION_SAMPLE_CHARS = 4000
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def detect_language(text: str, candidates: Iterable[str], default: str = "en") -> str:
+    """
+    Guess the language of text from its function words.
+
+    Args:
+        text: Text to classify.
+        candidates: Language codes to choose between.
+        default: Language returned when no candidate clearly wins.
+
+    Returns:
+        str: The best-scoring candidate language code, or default.
+    """
+    candidates = [lang for lang in candidates if lang in STOPWORDS]
+    if len(candidates) < 2:
+        return default
+
+    counts = dict.fromkeys(candidates, 0)
+    for word in _WORD_RE.findall(text[:DETECTION_SAMPLE_CHARS].lower()):
+        for lang in candidates:
+            if word in STOPWORDS[lang]:
+                counts[lang] += 1
+
+    best = max(counts, key=counts.get)
+    # Ties (e.g. code with no prose) go to the default language
+    if counts[best] == 0 or counts[best] == counts.get(default, -1):
+        return default
+    return best
+
+
+def estimate_model_size_mb(model_name: str) -> float:
+    """
+    Estimate the memory a spaCy model needs from its installed size on disk.
+
+    Args:
+        model_name: spaCy package name (e.g. "en_core_web_lg").
+
+    Returns:
+        float: Size in megabytes, or 0 if the model is not installed.
+    """
+    try:
+        import spacy.util
+
+        path = Path(spacy.util.get_package_path(model_name))
+    except Exception:
+        return 0.0
+
+    total = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return total / (1024 * 1024)
+
+
+class ModelCache(Generic[T]):
+    """
+    LRU of per-language engines, bounded by count and by estimated memory.
+
+    Engines are created on first use by the supplied factory. The least recently
+    used engine is evicted to make room, but the requested one is always kept.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], T],
+        max_models: int = 2,
+        memory_limit_mb: Optional[float] = None,
+        size_estimator: Callable[[str], float] = lambda language: 0.0,
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            factory: Builds the engine for a language code.
+            max_models: Maximum number of engines held at once.
+            memory_limit_mb: Ceiling on the total estimated size of held engines.
+            size_estimator: Returns the estimated size in MB of a language's engine.
+        """
+        self.factory = factory
+        self.max_models = max(1, max_models)
+        self.memory_limit_mb = memory_limit_mb
+        self.size_estimator = size_estimator
+        self._engines: "OrderedDict[str, T]" = OrderedDict()
+        self._sizes: Dict[str, float] = {}
+
+    def __contains__(self, language: str) -> bool:
+        return language in self._engines
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    @property
+    def loaded_languages(self):
+        """Languages currently held, least recently used first."""
+        return list(self._engines)
+
+    @property
+    def memory_mb(self) -> float:
+        """Total estimated size of the held engines."""
+        return sum(self._sizes.values())
+
+    def get(self, language: str) -> T:
+        """
+        Return the engine for a language, loading it if needed.
+
+        Args:
+            language: Language code.
+
+        Returns:
+            The engine for the language.
+        """
+        engine = self._engines.get(language)
+        if engine is not None:
+            self._engines.move_to_end(language)
+            return engine
+
+        size = self.size_estimator(language)
+        self._make_room(size)
+
+        logger.debug("Loading engine for language '%s' (~%.0f MB)", language, size)
+        engine = self.factory(language)
+        self._engines[language] = engine
+        self._sizes[language] = size
+        return engine
+
+    def _make_room(self, size: float) -> None:
+        """Evict least recently used engines until one of the given size fits."""
+        evicted = False
+        while self._engines and (
+            len(self._engines) >= self.max_models
+            or (
+                self.memory_limit_mb is not None
+                and self.memory_mb + size > self.memory_limit_mb
+            )
+        ):
+            language, _ = self._engines.popitem(last=False)
+            self._sizes.pop(language, None)
+            logger.debug("Evicted engine for language '%s'", language)
+            evicted = True
+
+        if evicted:
+            # spaCy models hold large reference cycles; release them now
+            gc.collect()
@@ -0,0 +1,628 @@
+"""Lightweight runtime metrics with Prometheus text-format export."""
+
+import atexit
+import functools
+import logging
+import os
+import re
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger("scrub")
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Seconds between periodic dumps
+DEFAULT_EXPORT_INTERVAL = 15.0
+
+# Samples that are not counts, so dumps keep their value instead of adding it up
+_GAUGES = frozenset({"scrub_start_time_seconds", "scrub_throughput_bytes_per_second"})
+
+Labels = Tuple[Tuple[str, str], ...]
+Samples = Dict[str, Dict[Labels, float]]
+
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][\w:]*)(?:\{(.*)\})?\s+(\S+)$")
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+# Running exporters; one per metrics file and socket in this process
+_exporters: List["MetricsExporter"] = []
+_exporters_lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-bucket histogram, rendered with cumulative Prometheus buckets."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Sorted bucket upper bounds; +Inf is added implicitly.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by interpolating within its bucket.
+
+        Args:
+            q: Quantile between 0 and 1.
+
+        Returns:
+            float: Estimated value, or 0 if the histogram is empty.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def render(self, name: str, help_text: str) -> List[str]:
+        """Return Prometheus text-format lines for this histogram."""
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum {self.sum!r}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+    def restore(self, samples: Samples, name: str) -> None:
+        """Add the buckets, sum and count of a previously rendered histogram."""
+        cumulative = samples.get(f"{name}_bucket", {})
+        previous = 0.0
+        for i, bound in enumerate(self.buckets + (float("inf"),)):
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            total = cumulative.get((("le", le),), previous)
+            self.counts[i] += int(total - previous)
+            previous = total
+        self.sum += _single(samples, f"{name}_sum")
+        self.count += int(_single(samples, f"{name}_count"))
+
+
+class ScrubMetrics:
+    """
+    Cumulative scrub metrics: latencies, throughput, entity hits, recognizer time.
+
+    Updates are a few additions under a lock, so collection stays cheap next to
+    the NLP pipeline.
+    """
+
+    def __init__(self):
+        """Initialize empty metrics."""
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.analyze_seconds = Histogram()
+        self.anonymize_seconds = Histogram()
+        self.bytes_total = 0
+        self.entities: Counter = Counter()
+        self.recognizer_seconds: Dict[str, float] = defaultdict(float)
+        self.recognizer_calls: Counter = Counter()
+        self.cache_hits: Counter = Counter()
+        self.cache_misses: Counter = Counter()
+
+    def observe_analyze(self, seconds: float, size: int) -> None:
+        """
+        Record one analysis.
+
+        Args:
+            seconds: Time spent analyzing.
+            size: Size of the analyzed text in bytes.
+        """
+        with self._lock:
+            self.analyze_seconds.observe(seconds)
+            self.bytes_total += size
+
+    def observe_redactions(self, entity_types: Iterable[str]) -> None:
+        """
+        Record the entities actually replaced, after overlapping results are resolved.
+
+        Args:
+            entity_types: Entity type of each replaced span.
+        """
+        with self._lock:
+            self.entities.update(entity_types)
+
+    def observe_anonymize(self, seconds: float) -> None:
+        """Record one anonymization."""
+        with self._lock:
+            self.anonymize_seconds.observe(seconds)
+
+    def observe_recognizer(self, name: str, seconds: float) -> None:
+        """Record one call to a recognizer or NLP engine."""
+        with self._lock:
+            self.recognizer_seconds[name] += seconds
+            self.recognizer_calls[name] += 1
+
+    def instrument(self, component, method: str = "analyze", name: Optional[str] = None) -> None:
+        """
+        Time every call to a method of a recognizer or NLP engine.
+
+        Args:
+            component: Object whose method is wrapped in place.
+            method: Name of the method to time.
+            name: Metric label (default: the component's ``name`` or class name).
+        """
+        name = name or getattr(component, "name", None) or type(component).__name__
+        wrapped = getattr(component, method)
+
+        @functools.wraps(wrapped)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return wrapped(*args, **kwargs)
+            finally:
+                self.observe_recognizer(name, time.perf_counter() - start)
+
+        setattr(component, method, timed)
+
+    def observe_cache(self, name: str, hit: bool) -> None:
+        """
+        Record one cache lookup.
+
+        Args:
+            name: Metric label for the cache.
+            hit: Whether the lookup was served from the cache.
+        """
+        with self._lock:
+            if hit:
+                self.cache_hits[name] += 1
+            else:
+                self.cache_misses[name] += 1
+
+    def render(self) -> str:
+        """
+        Render all metrics in Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text.
+        """
+        with self._lock:
+            busy = self.analyze_seconds.sum + self.anonymize_seconds.sum
+            lines = [
+                "# HELP scrub_start_time_seconds Unix time metrics collection started.",
+                "# TYPE scrub_start_time_seconds gauge",
+                f"scrub_start_time_seconds {self.started!r}",
+            ]
+            lines += self.analyze_seconds.render(
+                "scrub_analyze_seconds", "Time spent analyzing text."
+            )
+            lines += self.anonymize_seconds.render(
+                "scrub_anonymize_seconds", "Time spent replacing detected entities."
+            )
+            lines += [
+                "# HELP scrub_bytes_total Bytes of text analyzed.",
+                "# TYPE scrub_bytes_total counter",
+                f"scrub_bytes_total {self.bytes_total}",
+                "# HELP scrub_throughput_bytes_per_second Bytes analyzed per busy second.",
+                "# TYPE scrub_throughput_bytes_per_second gauge",
+                f"scrub_throughput_bytes_per_second {self.bytes_total / busy if busy else 0.0!r}",
+                "# HELP scrub_entities_total Redacted entities by type.",
+                "# TYPE scrub_entities_total counter",
+            ]
+            lines += [
+                f'scrub_entities_total{{entity_type="{_escape(entity)}"}} {count}'
+                for entity, count in sorted(self.entities.items())
+            ]
+            lines += [
+                "# HELP scrub_recognizer_seconds_total Time spent in each recognizer.",
+                "# TYPE scrub_recognizer_seconds_total counter",
+            ]
+            lines += [
+                f'scrub_recognizer_seconds_total{{recognizer="{_escape(name)}"}} {seconds!r}'
+                for name, seconds in sorted(self.recognizer_seconds.items())
+            ]
+            lines += [
+                "# HELP scrub_recognizer_calls_total Calls to each recognizer.",
+                "# TYPE scrub_recognizer_calls_total counter",
+            ]
+            lines += [
+                f'scrub_recognizer_calls_total{{recognizer="{_escape(name)}"}} {calls}'
+                for name, calls in sorted(self.recognizer_calls.items())
+            ]
+
+            caches = [
+                (name, self.cache_hits[name], self.cache_misses[name])
+                for name in sorted(set(self.cache_hits) | set(self.cache_misses))
+            ]
+            if caches:
+                lines += [
+                    "# HELP scrub_cache_hits_total Cache lookups served from the cache.",
+                    "# TYPE scrub_cache_hits_total counter",
+                ]
+                lines += [
+                    f'scrub_cache_hits_total{{cache="{_escape(name)}"}} {hits}'
+                    for name, hits, _ in caches
+                ]
+                lines += [
+                    "# HELP scrub_cache_misses_total Cache lookups that had to load.",
+                    "# TYPE scrub_cache_misses_total counter",
+                ]
+                lines += [
+                    f'scrub_cache_misses_total{{cache="{_escape(name)}"}} {misses}'
+                    for name, _, misses in caches
+                ]
+
+        return "\n".join(lines) + "\n"
+
+    def restore(self, text: str) -> None:
+        """
+        Add counters and histograms from a previous dump, so totals survive restarts.
+
+        Args:
+            text: Metrics text previously produced by render().
+        """
+        self.restore_samples(parse_prometheus(text))
+
+    def restore_samples(self, samples: Samples) -> None:
+        """
+        Add counters and histograms from parsed samples.
+
+        Args:
+            samples: Samples as returned by parse_prometheus().
+        """
+        with self._lock:
+            previous_start = _single(samples, "scrub_start_time_seconds", self.started)
+            self.started = min(self.started, previous_start)
+            self.analyze_seconds.restore(samples, "scrub_analyze_seconds")
+            self.anonymize_seconds.restore(samples, "scrub_anonymize_seconds")
+            self.bytes_total += int(_single(samples, "scrub_bytes_total"))
+            for labels, value in samples.get("scrub_entities_total", {}).items():
+                self.entities[dict(labels)["entity_type"]] += int(value)
+            for labels, value in samples.get("scrub_recognizer_seconds_total", {}).items():
+                self.recognizer_seconds[dict(labels)["recognizer"]] += value
+            for labels, value in samples.get("scrub_recognizer_calls_total", {}).items():
+                self.recognizer_calls[dict(labels)["recognizer"]] += int(value)
+            for labels, value in samples.get("scrub_cache_hits_total", {}).items():
+                self.cache_hits[dict(labels)["cache"]] += int(value)
+            for labels, value in samples.get("scrub_cache_misses_total", {}).items():
+                self.cache_misses[dict(labels)["cache"]] += int(value)
+
+
+class MetricsExporter:
+    """
+    Periodically writes metrics to a file and/or serves them on a Unix socket.
+
+    Several processes may export to the same file. Each dump adds what this
+    process counted since its previous dump to the totals in the file, under an
+    exclusive lock, and atomically replaces it. A client connecting to the socket
+    receives those totals plus this process's undumped counts, and the connection
+    is closed. The socket is only served if no other process is serving it.
+    """
+
+    def __init__(
+        self,
+        metrics: ScrubMetrics,
+        path: Optional[Path] = None,
+        socket_path: Optional[Path] = None,
+        interval: float = DEFAULT_EXPORT_INTERVAL,
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            metrics: Metrics to export.
+            path: File to write metrics to.
+            socket_path: Unix socket to serve metrics on.
+            interval: Seconds between file dumps.
+        """
+        self.metrics = metrics
+        self.path = Path(path).expanduser() if path else None
+        self.socket_path = Path(socket_path).expanduser() if socket_path else None
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[socketserver.UnixStreamServer] = None
+        # Inode of the socket this process bound, so only that one is removed
+        self._socket_inode: Optional[int] = None
+        # Samples already added to the file; the rest is this process's delta
+        self._dumped: Samples = {}
+        self._dump_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start background export."""
+        if self.path is not None:
+            self._thread = threading.Thread(target=self._run, name="scrub-metrics", daemon=True)
+            self._thread.start()
+
+        if self.socket_path is not None:
+            self._serve_socket()
+
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Write a final dump and stop background export."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            self._remove_own_socket()
+        if self.path is not None:
+            self.dump()
+
+    def render(self) -> str:
+        """
+        Render the totals: the metrics file plus this process's undumped counts.
+
+        Returns:
+            str: Metrics text.
+        """
+        if self.path is None:
+            return self.metrics.render()
+
+        totals = ScrubMetrics()
+        with self._dump_lock:
+            totals.restore_samples(self._read_file())
+            totals.restore_samples(self._delta(parse_prometheus(self.metrics.render())))
+        return totals.render()
+
+    def dump(self) -> None:
+        """Add this process's counts since the last dump to the metrics file."""
+        with self._dump_lock:
+            current = parse_prometheus(self.metrics.render())
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with _locked(self.path.with_name(f"{self.path.name}.lock")):
+                    totals = ScrubMetrics()
+                    totals.restore_samples(self._read_file())
+                    totals.restore_samples(self._delta(current))
+                    self._write_file(totals.render())
+            except OSError as e:
+                logger.warning("Failed to write metrics to %s: %s", self.path, e)
+                return
+            self._dumped = current
+
+    def _delta(self, current: Samples) -> Samples:
+        """Counts in current that have not been dumped yet; gauges are kept as is."""
+        delta: Samples = {}
+        for name, values in current.items():
+            dumped = {} if name in _GAUGES else self._dumped.get(name, {})
+            delta[name] = {
+                labels: value - dumped.get(labels, 0.0) for labels, value in values.items()
+            }
+        return delta
+
+    def _read_file(self) -> Samples:
+        """Parse the metrics file, or return no samples if it is missing or unreadable."""
+        try:
+            return parse_prometheus(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable metrics file %s: %s", self.path, e)
+            return {}
+
+    def _write_file(self, text: str) -> None:
+        """Atomically replace the metrics file."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+    def _run(self) -> None:
+        """Dump metrics every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def _serve_socket(self) -> None:
+        """Serve metrics text on the Unix socket, unless another process already does."""
+        if self.socket_path.exists():
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(1.0)
+                    sock.connect(str(self.socket_path))
+                logger.debug("Metrics socket %s is served by another process", self.socket_path)
+                return
+            except OSError:
+                # Left behind by a process that exited without cleaning up
+                self.socket_path.unlink(missing_ok=True)
+
+        exporter = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.sendall(exporter.render().encode("utf-8"))
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        except OSError as e:
+            logger.warning("Failed to serve metrics on %s: %s", self.socket_path, e)
+            return
+        self._socket_inode = self.socket_path.stat().st_ino
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="scrub-metrics-socket", daemon=True
+        ).start()
+
+    def _remove_own_socket(self) -> None:
+        """Remove the socket file if it is still the one this process bound."""
+        try:
+            if self.socket_path.stat().st_ino == self._socket_inode:
+                self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def _locked(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on lock_path, where the platform supports it."""
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def shared_exporter(
+    path: Optional[Path] = None,
+    socket_path: Optional[Path] = None,
+    interval: float = DEFAULT_EXPORT_INTERVAL,
+) -> MetricsExporter:
+    """
+    Return the running exporter for a metrics file or socket, starting one if needed.
+
+    Every scrubber in a process that exports to the same target shares one
+    exporter and its ScrubMetrics, so there is one background thread and one
+    exit hook per target and no exporter overwrites another's totals.
+
+    Args:
+        path: File to write metrics to.
+        socket_path: Unix socket to serve metrics on.
+        interval: Seconds between file dumps, used when starting an exporter.
+
+    Returns:
+        MetricsExporter: The started exporter.
+    """
+    path = Path(path).expanduser() if path else None
+    socket_path = Path(socket_path).expanduser() if socket_path else None
+
+    with _exporters_lock:
+        for exporter in _exporters:
+            if (path is not None and exporter.path == path) or (
+                socket_path is not None and exporter.socket_path == socket_path
+            ):
+                if (exporter.path, exporter.socket_path) != (path, socket_path):
+                    logger.warning(
+                        "Metrics are already exported to %s / %s; reusing that exporter",
+                        exporter.path,
+                        exporter.socket_path,
+                    )
+                return exporter
+
+        exporter = MetricsExporter(ScrubMetrics(), path, socket_path, interval)
+        exporter.start()
+        _exporters.append(exporter)
+        return exporter
+
+
+def read_metrics(path: Optional[Path] = None, socket_path: Optional[Path] = None) -> str:
+    """
+    Read metrics text from a Unix socket if given, otherwise from a file.
+
+    If nothing is serving the socket (no scrub process running) and a file is
+    given, the file is read instead.
+
+    Args:
+        path: Metrics file.
+        socket_path: Unix socket served by a running scrub process.
+
+    Returns:
+        str: Metrics text.
+
+    Raises:
+        OSError: If no source can be read.
+    """
+    if socket_path is not None:
+        try:
+            return _read_socket(Path(socket_path).expanduser())
+        except OSError as e:
+            if path is None:
+                raise
+            logger.debug("Metrics socket %s unavailable, reading %s: %s", socket_path, path, e)
+
+    return Path(path).expanduser().read_text()
+
+
+def _read_socket(socket_path: Path) -> str:
+    """Read everything a metrics socket sends until it closes the connection."""
+    chunks = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5.0)
+        sock.connect(str(socket_path))
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode("utf-8")
+
+
+def parse_prometheus(text: str) -> Samples:
+    """
+    Parse Prometheus text format into {metric name: {labels: value}}.
+
+    Args:
+        text: Metrics text.
+
+    Returns:
+        Samples: Parsed samples; labels are sorted (name, value) tuples.
+    """
+    samples: Samples = defaultdict(dict)
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE_RE.match(line)
+        if not match:
+            continue
+        name, raw_labels, value = match.groups()
+        labels = tuple(sorted((k, _unescape(v)) for k, v in _LABEL_RE.findall(raw_labels or "")))
+        samples[name][labels] = float(value)
+    return dict(samples)
+
+
+def histogram_from_samples(samples: Samples, name: str) -> Histogram:
+    """Rebuild a Histogram from parsed samples."""
+    histogram = Histogram()
+    histogram.restore(samples, name)
+    return histogram
+
+
+def _single(samples: Samples, name: str, default: float = 0.0) -> float:
+    """Value of an unlabelled sample."""
+    return samples.get(name, {}).get((), default)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _unescape(value: str) -> str:
+    """Undo _escape()."""
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
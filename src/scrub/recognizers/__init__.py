@@ -3,11 +3,14 @@
 from .corporate import CorporateNameRecognizer
 from .denylist import DenyListRecognizer
 from .domains import DomainRecognizer
+from .linear import BudgetedRegex, LinearPatternRecognizer
 from .uk_phone import UKPhoneRecognizer
 
 __all__ = [
+    "BudgetedRegex",
     "CorporateNameRecognizer",
     "DenyListRecognizer",
     "DomainRecognizer",
+    "LinearPatternRecognizer",
     "UKPhoneRecognizer",
 ]
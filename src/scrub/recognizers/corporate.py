@@ -2,10 +2,12 @@
 
 from typing import List, Optional
 
-from presidio_analyzer import Pattern, PatternRecognizer
+from presidio_analyzer import Pattern
 
+from .linear import DEFAULT_REGEX_TIMEOUT, LinearPatternRecognizer
 
-class CorporateNameRecognizer(PatternRecognizer):
+
+class CorporateNameRecognizer(LinearPatternRecognizer):
     """
     Recognizes corporate/organization names from a configured list.
     
@@ -16,6 +18,7 @@ class CorporateNameRecognizer(PatternRecognizer):
         self,
         company_names: Optional[List[str]] = None,
         supported_language: str = "en",
+        regex_timeout: float = DEFAULT_REGEX_TIMEOUT,
     ):
         """
         Initialize the corporate name recognizer.
@@ -23,6 +26,7 @@ class CorporateNameRecognizer(PatternRecognizer):
         Args:
             company_names: List of company/organization names to recognize.
             supported_language: Language code (default: "en").
+            regex_timeout: Time budget in seconds for each pattern on each input.
         """
         company_names = company_names or []
         
@@ -43,6 +47,7 @@ class CorporateNameRecognizer(PatternRecognizer):
             patterns=patterns,
             supported_language=supported_language,
             context=["company", "corp", "inc", "organization", "org"],
+            regex_timeout=regex_timeout,
         )
     
     @staticmethod
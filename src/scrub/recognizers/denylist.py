@@ -2,10 +2,12 @@
 
 from typing import List, Optional
 
-from presidio_analyzer import Pattern, PatternRecognizer
+from presidio_analyzer import Pattern
 
+from .linear import DEFAULT_REGEX_TIMEOUT, LinearPatternRecognizer
 
-class DenyListRecognizer(PatternRecognizer):
+
+class DenyListRecognizer(LinearPatternRecognizer):
     """
     Recognizes terms from a custom deny-list.
     
@@ -16,6 +18,7 @@ class DenyListRecognizer(PatternRecognizer):
         self,
         deny_list: Optional[List[str]] = None,
         supported_language: str = "en",
+        regex_timeout: float = DEFAULT_REGEX_TIMEOUT,
     ):
         """
         Initialize the deny-list recognizer.
@@ -23,6 +26,7 @@ class DenyListRecognizer(PatternRecognizer):
         Args:
             deny_list: List of terms to recognize and redact.
             supported_language: Language code (default: "en").
+            regex_timeout: Time budget in seconds for each pattern on each input.
         """
         deny_list = deny_list or []
         
@@ -45,6 +49,7 @@ class DenyListRecognizer(PatternRecognizer):
             patterns=patterns,
             supported_language=supported_language,
             context=[],  # No specific context needed for deny-list
+            regex_timeout=regex_timeout,
         )
     
     @staticmethod
@@ -2,10 +2,12 @@
 
 from typing import List, Optional
 
-from presidio_analyzer import Pattern, PatternRecognizer
+from presidio_analyzer import Pattern
 
+from .linear import DEFAULT_REGEX_TIMEOUT, LinearPatternRecognizer
 
-class DomainRecognizer(PatternRecognizer):
+
+class DomainRecognizer(LinearPatternRecognizer):
     """
     Recognizes internal domains in URLs only (not emails or paths).
     
@@ -18,6 +20,7 @@ class DomainRecognizer(PatternRecognizer):
         self,
         domains: Optional[List[str]] = None,
         supported_language: str = "en",
+        regex_timeout: float = DEFAULT_REGEX_TIMEOUT,
     ):
         """
         Initialize the domain recognizer.
@@ -25,6 +28,7 @@ class DomainRecognizer(PatternRecognizer):
         Args:
             domains: List of internal domains to recognize (e.g., "internal.company.com").
             supported_language: Language code (default: "en").
+            regex_timeout: Time budget in seconds for each pattern on each input.
         """
         domains = domains or []
         
@@ -48,6 +52,7 @@ class DomainRecognizer(PatternRecognizer):
             patterns=patterns,
             supported_language=supported_language,
             context=["url", "http", "https", "www", "visit", "goto"],
+            regex_timeout=regex_timeout,
         )
     
     @staticmethod
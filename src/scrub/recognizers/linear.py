@@ -0,0 +1,214 @@
+"""Linear-time regex matching for custom recognizers."""
+
+import logging
+import re
+import time
+from typing import Iterator, Optional, Tuple
+
+from presidio_analyzer import Pattern, PatternRecognizer
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - optional dependency
+    re2 = None
+
+try:
+    import regex
+except ImportError:  # pragma: no cover - presidio normally pulls this in
+    regex = None
+
+logger = logging.getLogger("scrub")
+
+# Default time budget (seconds) for matching one pattern against one input
+DEFAULT_REGEX_TIMEOUT = 1.0
+
+# Presidio's default flags, used if the installed version does not expose them
+DEFAULT_REGEX_FLAGS = re.DOTALL | re.MULTILINE | re.IGNORECASE
+
+# Python regex flags that RE2 accepts as an inline group, e.g. "(?ims)"
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+
+# Unicode equivalents of Python's \s, \d and \w, which RE2 treats as ASCII-only
+_RE2_CLASSES = {
+    "s": r"\s\x{1c}-\x{1f}\x{85}\p{Z}",
+    "d": r"\p{Nd}",
+    "w": r"\p{L}\p{N}_",
+}
+
+
+class BudgetedRegex:
+    """
+    Compiled pattern that prefers RE2 and stops matching once its time budget is spent.
+
+    RE2 guarantees matching time linear in the input length. Patterns RE2 cannot
+    compile (backreferences, lookaround) fall back to the ``regex`` module, whose
+    own timeout interrupts runaway backtracking, or to the standard ``re`` module.
+
+    RE2 treats ``\\w``, ``\\d`` and ``\\s`` as ASCII-only, so they are rewritten to
+    Unicode classes first; otherwise a non-breaking space would not count as
+    whitespace. RE2 has no Unicode ``\\b``, so patterns using it (e.g.
+    ``\\bNestlé\\b``) are compiled with the backtracking fallback instead.
+    """
+
+    def __init__(self, pattern: str, flags: int = 0, timeout: float = DEFAULT_REGEX_TIMEOUT):
+        """
+        Compile a pattern on the fastest safe engine available.
+
+        Args:
+            pattern: Regular expression source.
+            flags: Python ``re`` flags to compile with.
+            timeout: Time budget in seconds for each finditer() call.
+        """
+        self.pattern = pattern
+        self.flags = flags
+        self.timeout = timeout
+        self.engine, self._compiled = self._compile(pattern, flags)
+
+    @staticmethod
+    def _compile(pattern: str, flags: int) -> Tuple[str, object]:
+        """
+        Compile with RE2 if possible, otherwise with a backtracking engine.
+
+        Args:
+            pattern: Regular expression source.
+            flags: Python ``re`` flags to compile with.
+
+        Returns:
+            Tuple[str, object]: Engine name and compiled pattern.
+        """
+        source = _unicode_re2_pattern(pattern) if re2 is not None else None
+        if source is not None:
+            inline = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+            options = re2.Options()
+            # A rejected pattern is expected; don't log it to stderr
+            options.log_errors = False
+            try:
+                return "re2", re2.compile(f"(?{inline}){source}" if inline else source, options)
+            except re2.error:
+                logger.debug("Pattern not supported by RE2, falling back: %s", pattern)
+
+        if regex is not None:
+            return "regex", regex.compile(pattern, flags)
+
+        return "re", re.compile(pattern, flags)
+
+    def finditer(self, text: str, timeout: Optional[float] = None) -> Iterator:
+        """
+        Iterate over matches in text, giving up once the time budget is spent.
+
+        Args:
+            text: Text to search.
+            timeout: Ignored; accepted for compatibility with Presidio, which
+                passes its own global timeout. The budget set at construction wins.
+
+        Yields:
+            Match objects, in order.
+
+        Raises:
+            TimeoutError: If matching exceeds the time budget. Matches already
+                yielded remain valid.
+        """
+        deadline = time.monotonic() + self.timeout
+
+        if self.engine == "regex":
+            matches = self._compiled.finditer(text, timeout=self.timeout)
+        else:
+            matches = self._compiled.finditer(text)
+
+        for match in matches:
+            yield match
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Pattern exceeded its {self.timeout}s budget on {len(text)} chars"
+                )
+
+
+class LinearPatternRecognizer(PatternRecognizer):
+    """
+    PatternRecognizer whose patterns run on RE2 where possible, under a time budget.
+
+    Base class for the custom recognizers. Patterns are precompiled into
+    ``BudgetedRegex`` objects so Presidio uses them instead of compiling its own.
+    """
+
+    def __init__(self, *args, regex_timeout: float = DEFAULT_REGEX_TIMEOUT, **kwargs):
+        """
+        Initialize the recognizer and precompile its patterns.
+
+        Args:
+            *args: Positional arguments for PatternRecognizer.
+            regex_timeout: Time budget in seconds for each pattern on each input.
+            **kwargs: Keyword arguments for PatternRecognizer.
+        """
+        super().__init__(*args, **kwargs)
+        self.regex_timeout = regex_timeout
+
+        flags = getattr(self, "global_regex_flags", None) or DEFAULT_REGEX_FLAGS
+        # Copy patterns so class-level pattern lists are not mutated
+        self.patterns = [self._compile_pattern(p, flags) for p in self.patterns]
+
+    def _compile_pattern(self, pattern: Pattern, flags: int) -> Pattern:
+        """
+        Return a copy of a pattern carrying a precompiled BudgetedRegex.
+
+        Args:
+            pattern: Pattern to compile.
+            flags: Regex flags Presidio will match with.
+
+        Returns:
+            Pattern: Copy of the pattern with ``compiled_regex`` populated.
+        """
+        compiled = Pattern(name=pattern.name, regex=pattern.regex, score=pattern.score)
+        compiled.compiled_regex = BudgetedRegex(
+            pattern.regex, flags=flags, timeout=self.regex_timeout
+        )
+        compiled.compiled_with_flags = flags
+        return compiled
+
+
+def _unicode_re2_pattern(pattern: str) -> Optional[str]:
+    """
+    Rewrite a Python pattern so RE2 matches \\s, \\d and \\w as Python does.
+
+    Args:
+        pattern: Python regular expression source.
+
+    Returns:
+        Optional[str]: RE2 source, or None if the pattern needs a Unicode \\b or
+        \\B, or a negated class escape inside brackets, which RE2 cannot express.
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            escape = pattern[i + 1]
+            if escape in "bB":
+                return None
+            body = _RE2_CLASSES.get(escape.lower())
+            if body is None:
+                out.append(pattern[i : i + 2])
+            elif in_class:
+                if escape.isupper():
+                    return None
+                out.append(body)
+            else:
+                out.append(f"[^{body}]" if escape.isupper() else f"[{body}]")
+            i += 2
+        elif char == "[" and not in_class:
+            # A "]" right after "[" or "[^" is a literal, not the end of the class
+            end = i + 1
+            if pattern[end : end + 1] == "^":
+                end += 1
+            if pattern[end : end + 1] == "]":
+                end += 1
+            out.append(pattern[i:end])
+            in_class = True
+            i = end
+        else:
+            if char == "]":
+                in_class = False
+            out.append(char)
+            i += 1
+    return "".join(out)
@@ -2,10 +2,12 @@
 
 from typing import List, Optional
 
-from presidio_analyzer import Pattern, PatternRecognizer
+from presidio_analyzer import Pattern
 
+from .linear import DEFAULT_REGEX_TIMEOUT, LinearPatternRecognizer
 
-class UKPhoneRecognizer(PatternRecognizer):
+
+class UKPhoneRecognizer(LinearPatternRecognizer):
     """
     Recognizes UK phone numbers in various formats.
     
@@ -35,16 +37,22 @@ class UKPhoneRecognizer(PatternRecognizer):
         ),
     ]
     
-    def __init__(self, supported_language: str = "en"):
+    def __init__(
+        self,
+        supported_language: str = "en",
+        regex_timeout: float = DEFAULT_REGEX_TIMEOUT,
+    ):
         """
         Initialize UK phone recognizer.
         
         Args:
             supported_language: Language code (default: "en").
+            regex_timeout: Time budget in seconds for each pattern on each input.
         """
         super().__init__(
             supported_entity="UK_PHONE_NUMBER",
             patterns=self.PATTERNS,
             supported_language=supported_language,
             context=["phone", "mobile", "tel", "call", "contact"],
+            regex_timeout=regex_timeout,
         )
@@ -1,13 +1,23 @@
 """Core text scrubbing functionality using Presidio."""
 
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
-from presidio_analyzer.nlp_engine import NlpEngineProvider
+from presidio_analyzer import (
+    AnalyzerEngine,
+    EntityRecognizer,
+    PatternRecognizer,
+    RecognizerRegistry,
+    RecognizerResult,
+)
+from presidio_analyzer.nlp_engine import NlpArtifacts, NlpEngineProvider
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
 
 from .config import Config
+from .gating import CandidateScanner, coverage
+from .languages import ModelCache, detect_language, estimate_model_size_mb
+from .metrics import ScrubMetrics, shared_exporter
 from .recognizers import (
     CorporateNameRecognizer,
     DenyListRecognizer,
@@ -15,6 +25,9 @@ from .recognizers import (
     UKPhoneRecognizer,
 )
 
+# Joins NER windows; a paragraph break keeps spaCy from linking adjacent windows
+_WINDOW_SEPARATOR = "\n\n"
+
 
 class TextScrubber:
     """
@@ -29,75 +42,302 @@ class TextScrubber:
             config: Configuration containing corporate terms to redact.
         """
         self.config = config or Config()
-        self.analyzer = self._create_analyzer()
+        # One analyzer per language, each loaded on first use
+        self.analyzers = ModelCache(
+            factory=self._create_analyzer,
+            max_models=self.config.max_models,
+            memory_limit_mb=self.config.memory_limit_mb,
+            size_estimator=lambda lang: estimate_model_size_mb(self.config.models[lang]),
+        )
         self.anonymizer = AnonymizerEngine()
+        # Candidate scanners for NER gating, built on first use per language
+        self._scanners: Dict[str, CandidateScanner] = {}
+        # Gated analyses, and those that fell back to full NER on too much coverage
+        self.gated_runs = 0
+        self.gating_fallbacks = 0
+        
+        # Runtime metrics, optionally exported for `scrub stats` or Prometheus.
+        # Scrubbers exporting to the same target share one exporter and its metrics.
+        self.metrics = None
+        self.exporter = None
+        if self.config.metrics_enabled:
+            if self.config.metrics_path or self.config.metrics_socket:
+                self.exporter = shared_exporter(
+                    path=self.config.metrics_path,
+                    socket_path=self.config.metrics_socket,
+                    interval=self.config.metrics_interval,
+                )
+                self.metrics = self.exporter.metrics
+            else:
+                self.metrics = ScrubMetrics()
+    
+    @property
+    def analyzer(self) -> AnalyzerEngine:
+        """Analyzer for the default language."""
+        return self.analyzers.get(self.config.default_language)
     
-    def _create_analyzer(self) -> AnalyzerEngine:
+    def _create_analyzer(self, language: str) -> AnalyzerEngine:
         """
-        Create and configure the Presidio analyzer with custom recognizers.
+        Create and configure the Presidio analyzer for one language.
         
+        Args:
+            language: Language code; its spaCy model comes from the config.
+            
         Returns:
             AnalyzerEngine: Configured analyzer instance.
         """
         # Create NLP engine (using spaCy)
         nlp_configuration = {
             "nlp_engine_name": "spacy",
-            "models": [{"lang_code": "en", "model_name": "en_core_web_lg"}],
+            "models": [{"lang_code": language, "model_name": self.config.models[language]}],
         }
         
         provider = NlpEngineProvider(nlp_configuration=nlp_configuration)
         nlp_engine = provider.create_engine()
         
         # Create registry with custom recognizers
-        registry = RecognizerRegistry()
+        registry = RecognizerRegistry(supported_languages=[language])
         
         # Load default recognizers (email, phone, SSN, credit card, etc.)
-        registry.load_predefined_recognizers(nlp_engine=nlp_engine)
+        registry.load_predefined_recognizers(languages=[language], nlp_engine=nlp_engine)
+        self._add_english_pattern_recognizers(registry, language)
         
         # Add custom recognizers for corporate information
         if self.config.company_names:
             corporate_recognizer = CorporateNameRecognizer(
-                company_names=self.config.company_names
+                company_names=self.config.company_names,
+                supported_language=language,
+                regex_timeout=self.config.regex_timeout,
             )
             registry.add_recognizer(corporate_recognizer)
         
         if self.config.domains:
-            domain_recognizer = DomainRecognizer(domains=self.config.domains)
+            domain_recognizer = DomainRecognizer(
+                domains=self.config.domains,
+                supported_language=language,
+                regex_timeout=self.config.regex_timeout,
+            )
             registry.add_recognizer(domain_recognizer)
         
         if self.config.project_names:
             # Project names can use the corporate recognizer with different entity type
             project_recognizer = CorporateNameRecognizer(
-                company_names=self.config.project_names
+                company_names=self.config.project_names,
+                supported_language=language,
+                regex_timeout=self.config.regex_timeout,
             )
             # Override entity type
             project_recognizer.supported_entities = ["PROJECT_NAME"]
+            project_recognizer.name = "ProjectNameRecognizer"
             registry.add_recognizer(project_recognizer)
         
         if self.config.deny_list:
-            denylist_recognizer = DenyListRecognizer(deny_list=self.config.deny_list)
+            denylist_recognizer = DenyListRecognizer(
+                deny_list=self.config.deny_list,
+                supported_language=language,
+                regex_timeout=self.config.regex_timeout,
+            )
             registry.add_recognizer(denylist_recognizer)
         
         # Add UK phone number recognizer (always enabled)
-        uk_phone_recognizer = UKPhoneRecognizer()
+        uk_phone_recognizer = UKPhoneRecognizer(
+            supported_language=language,
+            regex_timeout=self.config.regex_timeout,
+        )
         registry.add_recognizer(uk_phone_recognizer)
         
         # Create analyzer with custom registry
         analyzer = AnalyzerEngine(
             registry=registry,
             nlp_engine=nlp_engine,
-            supported_languages=["en"],
+            supported_languages=[language],
         )
         
+        # Time each recognizer and the spaCy pipeline
+        if self.metrics is not None:
+            for recognizer in registry.recognizers:
+                self.metrics.instrument(recognizer)
+            self.metrics.instrument(nlp_engine, method="process_text")
+        
         return analyzer
     
-    def scrub(self, text: str, language: str = "en") -> str:
+    @staticmethod
+    def _add_english_pattern_recognizers(registry: RecognizerRegistry, language: str) -> None:
+        """
+        Register Presidio's English-only pattern recognizers for another language.
+        
+        Presidio ships credit card, NHS, US ID and similar recognizers for English
+        only, but their patterns do not depend on the language of the surrounding
+        text. Without them, text detected as German or French would lose coverage.
+        
+        Args:
+            registry: Registry for the language, with its predefined recognizers loaded.
+            language: Language code of the registry.
+        """
+        if language == "en":
+            return
+        
+        present = {type(recognizer) for recognizer in registry.recognizers}
+        english = RecognizerRegistry()
+        english.load_predefined_recognizers(languages=["en"])
+        for recognizer in english.recognizers:
+            recognizer_cls = type(recognizer)
+            if not isinstance(recognizer, PatternRecognizer) or recognizer_cls in present:
+                continue
+            try:
+                registry.add_recognizer(recognizer_cls(supported_language=language))
+            except TypeError:
+                # Needs constructor arguments we cannot supply generically
+                continue
+    
+    def detect_language(self, text: str) -> str:
+        """
+        Pick the configured language that best matches the text.
+        
+        Detection is skipped when only one language is configured.
+        
+        Args:
+            text: The text to classify.
+            
+        Returns:
+            str: Language code.
+        """
+        if len(self.config.models) == 1:
+            return next(iter(self.config.models))
+        
+        return detect_language(
+            text,
+            candidates=self.config.models,
+            default=self.config.default_language,
+        )
+    
+    def _get_analyzer(self, text: str, language: Optional[str]) -> Tuple[AnalyzerEngine, str]:
+        """
+        Resolve the language for text and return its analyzer.
+        
+        Args:
+            text: The text to be analyzed.
+            language: Explicit language code, or None to detect it.
+            
+        Returns:
+            Tuple[AnalyzerEngine, str]: The analyzer and the language code.
+            
+        Raises:
+            ValueError: If the language has no model configured.
+        """
+        if language is None:
+            language = self.detect_language(text)
+        
+        if language not in self.config.models:
+            raise ValueError(
+                f"No model configured for language '{language}'. "
+                f"Add it under 'languages.models' in the config file."
+            )
+        
+        if self.metrics is not None:
+            self.metrics.observe_cache("models", language in self.analyzers)
+        return self.analyzers.get(language), language
+    
+    def _get_scanner(self, analyzer: AnalyzerEngine, language: str) -> CandidateScanner:
+        """
+        Return the NER candidate scanner for a language.
+        
+        Its context words are those declared by the language's recognizers.
+        
+        Args:
+            analyzer: The analyzer for the language.
+            language: Language code.
+            
+        Returns:
+            CandidateScanner: Scanner for the language.
+        """
+        scanner = self._scanners.get(language)
+        if scanner is None:
+            context_words = [
+                word
+                for recognizer in analyzer.registry.get_recognizers(language, all_fields=True)
+                for word in (getattr(recognizer, "context", None) or [])
+            ]
+            scanner = CandidateScanner(context_words, padding=self.config.ner_window)
+            self._scanners[language] = scanner
+        return scanner
+    
+    def _run_analyzer(
+        self, analyzer: AnalyzerEngine, text: str, language: str
+    ) -> List[RecognizerResult]:
+        """
+        Run the analyzer, restricting NER to candidate regions if gating is enabled.
+        
+        With gating, pattern recognizers still cover the full text, which is only
+        tokenized; the spaCy pipeline runs on the windows around capitalized words
+        and recognizer context words. Falls back to full analysis when those
+        windows cover most of the text anyway.
+        
+        Args:
+            analyzer: The analyzer for the language.
+            text: The text to analyze.
+            language: Language code.
+            
+        Returns:
+            List[RecognizerResult]: Detected entities.
+        """
+        if not self.config.ner_gating:
+            return analyzer.analyze(text=text, language=language)
+        
+        self.gated_runs += 1
+        windows = self._get_scanner(analyzer, language).windows(text)
+        if coverage(windows, len(text)) > self.config.ner_max_coverage:
+            self.gating_fallbacks += 1
+            return analyzer.analyze(text=text, language=language)
+        
+        # Stage 1: every recognizer over the full text, with tokens but no NER entities
+        nlp_engine = analyzer.nlp_engine
+        doc = nlp_engine.get_nlp(language).make_doc(text)
+        tokens_only = NlpArtifacts(
+            entities=[],
+            tokens=doc,
+            tokens_indices=[token.idx for token in doc],
+            # No lemmatizer runs here; the tokenizer's norm stands in for the lemma
+            lemmas=[token.norm_ for token in doc],
+            nlp_engine=nlp_engine,
+            language=language,
+        )
+        results = analyzer.analyze(text=text, language=language, nlp_artifacts=tokens_only)
+        
+        # Stage 2: full pipeline, NER entities only, on the candidate windows joined
+        # into one text so the analyzer runs once
+        joined = _WINDOW_SEPARATOR.join(text[start:end] for start, end in windows)
+        offsets = []  # (position in joined, position in text, window length)
+        pos = 0
+        for start, end in windows:
+            offsets.append((pos, start, end - start))
+            pos += end - start + len(_WINDOW_SEPARATOR)
+        
+        ner_entities = nlp_engine.get_supported_entities()
+        index = 0
+        for result in sorted(
+            analyzer.analyze(text=joined, language=language, entities=ner_entities),
+            key=lambda r: r.start,
+        ):
+            while index + 1 < len(offsets) and offsets[index + 1][0] <= result.start:
+                index += 1
+            joined_start, text_start, length = offsets[index]
+            # Drop anything spanning the separator between two windows
+            if result.end - joined_start > length:
+                continue
+            result.start += text_start - joined_start
+            result.end += text_start - joined_start
+            results.append(result)
+        
+        return EntityRecognizer.remove_duplicates(results)
+    
+    def scrub(self, text: str, language: Optional[str] = None) -> str:
         """
         Scrub PII and corporate information from text.
         
         Args:
             text: The text to scrub.
-            language: Language code (default: "en").
+            language: Language code. Detected from the text if not given.
             
         Returns:
             str: The scrubbed text with PII replaced by type labels.
@@ -106,10 +346,7 @@ class TextScrubber:
             return text
         
         # Analyze text for PII
-        results = self.analyzer.analyze(
-            text=text,
-            language=language,
-        )
+        results = self._analyze(text, language)
         
         # Create operators for each entity type to replace with <TYPE> labels
         operators = {}
@@ -122,15 +359,19 @@ class TextScrubber:
             return text
         
         # Anonymize with custom operators
+        start = time.perf_counter()
         anonymized = self.anonymizer.anonymize(
             text=text,
             analyzer_results=results,
             operators=operators,
         )
+        if self.metrics is not None:
+            self.metrics.observe_anonymize(time.perf_counter() - start)
+            self.metrics.observe_redactions(item.entity_type for item in anonymized.items)
         
         return anonymized.text
     
-    def analyze(self, text: str, language: str = "en") -> List:
+    def analyze(self, text: str, language: Optional[str] = None) -> List:
         """
         Analyze text and return detected PII entities without anonymizing.
         
@@ -138,7 +379,7 @@ class TextScrubber:
         
         Args:
             text: The text to analyze.
-            language: Language code (default: "en").
+            language: Language code. Detected from the text if not given.
             
         Returns:
             List: List of detected PII entities.
@@ -146,7 +387,29 @@ class TextScrubber:
         if not text or not text.strip():
             return []
         
-        return self.analyzer.analyze(text=text, language=language)
+        return self._analyze(text, language)
+    
+    def _analyze(self, text: str, language: Optional[str]) -> List[RecognizerResult]:
+        """
+        Resolve the analyzer for text, run it and record metrics.
+        
+        Args:
+            text: The text to analyze.
+            language: Language code, or None to detect it.
+            
+        Returns:
+            List[RecognizerResult]: Detected entities.
+        """
+        analyzer, language = self._get_analyzer(text, language)
+        
+        start = time.perf_counter()
+        results = self._run_analyzer(analyzer, text, language)
+        if self.metrics is not None:
+            self.metrics.observe_analyze(
+                time.perf_counter() - start, len(text.encode("utf-8", "surrogateescape"))
+            )
+        
+        return results
 
 
 def scrub_text(text: str, config: Optional[Config] = None) -> str:
@@ -0,0 +1,33 @@
+"""Tests for configuration loading."""
+
+import pytest
+
+from scrub.config import Config
+
+
+def write_config(tmp_path, text):
+    """Write a config file and return its path."""
+    path = tmp_path / "config.yaml"
+    path.write_text(text)
+    return path
+
+
+def test_default_language_is_english_when_configured():
+    assert Config(models={"de": "de_model", "en": "en_model"}).default_language == "en"
+
+
+def test_default_language_falls_back_to_first_model(tmp_path):
+    path = write_config(
+        tmp_path,
+        "languages:\n  models:\n    de: de_model\n    fr: fr_model\n",
+    )
+    assert Config.load(path).default_language == "de"
+
+
+def test_default_language_without_model_is_rejected(tmp_path):
+    path = write_config(
+        tmp_path,
+        "languages:\n  default: en\n  models:\n    de: de_model\n",
+    )
+    with pytest.raises(ValueError, match="Default language 'en'"):
+        Config.load(path)
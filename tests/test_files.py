@@ -0,0 +1,156 @@
+"""Tests for windowed file scrubbing."""
+
+import re
+
+import pytest
+from presidio_analyzer import RecognizerResult
+from presidio_anonymizer import AnonymizerEngine
+
+from scrub.files import (
+    _merge_space_separated,
+    _to_byte_spans,
+    iter_windows,
+    resolve_spans,
+    scrub_file,
+)
+from scrub.metrics import ScrubMetrics
+
+NAME_RE = re.compile(r"Jane Smith|José Müller")
+PHONE_RE = re.compile(r"07700 \d{6}")
+LICENSE_RE = re.compile(r"\b\d{6}\b")
+
+
+class RegexScrubber:
+    """Stands in for TextScrubber, finding names and phone numbers by regex."""
+
+    def analyze(self, text, language=None):
+        results = [
+            RecognizerResult("PERSON", m.start(), m.end(), 0.85) for m in NAME_RE.finditer(text)
+        ]
+        results += [
+            RecognizerResult("PHONE_NUMBER", m.start(), m.end(), 0.75)
+            for m in PHONE_RE.finditer(text)
+        ]
+        # Fragment of a phone number, as predefined recognizers report it
+        results += [
+            RecognizerResult("US_DRIVER_LICENSE", m.start(), m.end(), 0.3)
+            for m in LICENSE_RE.finditer(text)
+        ]
+        return results
+
+
+class FailingScrubber:
+    """Stands in for TextScrubber, failing on every call."""
+
+    def analyze(self, text, language=None):
+        raise RuntimeError("analyzer failed")
+
+
+def anonymize(text, results):
+    """Scrub text the way the stdin path does."""
+    return AnonymizerEngine().anonymize(text=text, analyzer_results=results).text
+
+
+def apply_spans(text, spans):
+    """Replace character spans with <ENTITY_TYPE> labels."""
+    parts, pos = [], 0
+    for start, end, entity_type in spans:
+        parts += [text[pos:start], f"<{entity_type}>"]
+        pos = end
+    return "".join(parts) + text[pos:]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "é".encode("utf-8") * 3000,
+        "日本語".encode("utf-8") * 1000,
+        b"\xff\x80\xc3" * 1000 + "ü".encode("utf-8") * 500,
+    ],
+)
+def test_iter_windows_split_on_character_boundaries(data):
+    windows = list(iter_windows(data, window_size=1024))
+    assert windows[0][0] == 0 and windows[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    decoded = [data[start:end].decode("utf-8", "surrogateescape") for start, end in windows]
+    assert "".join(decoded).encode("utf-8", "surrogateescape") == data
+    if b"\xff" not in data:
+        # Valid UTF-8 stays valid in every window
+        for start, end in windows:
+            data[start:end].decode("utf-8")
+
+
+def test_iter_windows_prefer_line_breaks():
+    data = (b"x" * 700 + b"\n") * 10
+    for start, end in iter_windows(data, window_size=1024):
+        assert end == len(data) or data[end - 1 : end] == b"\n"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Call Jane Smith on 07700 900123 or 07700 900456 today.",
+        "Jane Smith Jane Smith, 07700 900123",
+        "José Müller: 07700 123456 (ref 654321)",
+    ],
+)
+def test_resolve_spans_match_anonymizer(text):
+    results = RegexScrubber().analyze(text)
+    spans = _merge_space_separated(text, resolve_spans(results))
+    assert apply_spans(text, spans) == anonymize(text, results)
+
+
+def test_to_byte_spans_with_multibyte_text():
+    text = "Grüße an José Müller, 日本 07700 900123"
+    spans = [(m.start(), m.end(), "X") for m in re.finditer(r"José Müller|07700 900123", text)]
+    data = text.encode("utf-8")
+    byte_spans = _to_byte_spans(text, spans, single_byte=False)
+    assert [data[start:end].decode("utf-8") for start, end, _ in byte_spans] == [
+        "José Müller",
+        "07700 900123",
+    ]
+
+
+def test_entities_crossing_window_edges_are_redacted(tmp_path):
+    text = " ".join(f"Jane Smith 07700 {n:06d} José Müller" for n in range(1000)) + "\n"
+    src = tmp_path / "in.txt"
+    src.write_text(text, encoding="utf-8")
+
+    scrub_file(RegexScrubber(), src, tmp_path / "out.txt", window_size=1024)
+
+    scrubbed = (tmp_path / "out.txt").read_text(encoding="utf-8")
+    assert scrubbed == anonymize(text, RegexScrubber().analyze(text))
+    assert "Jane" not in scrubbed and "07700" not in scrubbed
+
+
+def test_temp_file_removed_on_error(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("Jane Smith\n")
+
+    with pytest.raises(RuntimeError):
+        scrub_file(FailingScrubber(), src)
+
+    assert [p.name for p in tmp_path.iterdir()] == ["in.txt"]
+    assert src.read_text() == "Jane Smith\n"
+
+
+def test_window_size_is_capped(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("x\n")
+    with pytest.raises(ValueError, match="exceeds the maximum"):
+        scrub_file(RegexScrubber(), src, window_size=10 * 1024 * 1024)
+
+
+def test_metrics_count_only_replaced_entities(tmp_path):
+    src = tmp_path / "in.txt"
+    src.write_text("Jane Smith on 07700 900123, ref 654321\n")
+    scrubber = RegexScrubber()
+    scrubber.metrics = ScrubMetrics()
+
+    scrub_file(scrubber, src)
+
+    assert scrubber.metrics.entities == {
+        "PERSON": 1,
+        "PHONE_NUMBER": 1,
+        "US_DRIVER_LICENSE": 1,
+    }
@@ -0,0 +1,87 @@
+"""Tests for the NER candidate scanner."""
+
+import re
+
+import spacy
+from presidio_analyzer import RecognizerRegistry, RecognizerResult
+
+from scrub import Config, TextScrubber
+from scrub.gating import MAX_TOKEN_WIDENING, CandidateScanner
+from scrub.recognizers import UKPhoneRecognizer
+
+
+def test_window_widens_only_to_nearest_whitespace():
+    text = "x" * 300 + " Jane " + "y" * 300
+    start, end = CandidateScanner([], padding=50).windows(text)[0]
+    name = text.index("Jane")
+    assert name - start <= 50 + MAX_TOKEN_WIDENING
+    assert end - (name + len("Jane")) <= 50 + MAX_TOKEN_WIDENING
+
+
+def test_window_ends_on_whitespace_when_close():
+    text = "alpha beta gamma Jane delta epsilon zeta"
+    start, end = CandidateScanner([], padding=8).windows(text)[0]
+    assert start == 0 or text[start - 1].isspace()
+    assert end == len(text) or text[end].isspace()
+
+
+def test_identifiers_are_not_candidates():
+    text = 'if (err != nil) { return fmt.Errorf("read: %w", err) }'
+    assert CandidateScanner([], padding=10).windows(text) == []
+
+
+def test_context_words_are_candidates():
+    assert CandidateScanner(["phone"], padding=0).windows("call my phone now") == [(8, 13)]
+
+
+class FakeNlpEngine:
+    """Tokenizer-only NLP engine reporting PERSON as its only entity."""
+
+    def __init__(self):
+        self.nlp = spacy.blank("en")
+
+    def get_nlp(self, language):
+        return self.nlp
+
+    def get_supported_entities(self):
+        return ["PERSON"]
+
+    def is_stopword(self, word, language):
+        return False
+
+    def is_punct(self, word, language):
+        return False
+
+
+class FakeAnalyzer:
+    """
+    Analyzer whose NER finds runs of capitalized words and, in the gated stage,
+    also reports one result covering the whole joined text.
+    """
+
+    def __init__(self):
+        self.nlp_engine = FakeNlpEngine()
+        self.registry = RecognizerRegistry(supported_languages=["en"])
+        self.registry.add_recognizer(UKPhoneRecognizer())
+
+    def analyze(self, text, language, entities=None, nlp_artifacts=None):
+        if nlp_artifacts is not None:
+            return []
+        results = [
+            RecognizerResult("PERSON", m.start(), m.end(), 0.85)
+            for m in re.finditer(r"[A-Z][a-z]+ [A-Z][a-z]+", text)
+        ]
+        if entities is not None:
+            results.append(RecognizerResult("PERSON", 0, len(text), 0.5))
+        return results
+
+
+def test_gated_results_map_back_to_original_offsets():
+    scrubber = TextScrubber(Config(ner_gating=True, ner_window=10, metrics_enabled=False))
+    filler = "x = compute(1)\n" * 20
+    text = filler + "please ask Jane Smith today.\n" + filler + "Bob Stone replied.\n" + filler
+
+    results = scrubber._run_analyzer(FakeAnalyzer(), text, "en")
+
+    assert sorted(text[r.start : r.end] for r in results) == ["Bob Stone", "Jane Smith"]
+    assert scrubber.gating_fallbacks == 0
@@ -0,0 +1,90 @@
+"""Tests for language detection and the per-language model cache."""
+
+import pytest
+
+from scrub import languages
+from scrub.languages import ModelCache, detect_language
+
+
+def make_cache(**kwargs):
+    """Cache whose engines are "<language>-engine" strings, recording each load."""
+    loads = []
+
+    def factory(language):
+        loads.append(language)
+        return f"{language}-engine"
+
+    return ModelCache(factory, **kwargs), loads
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("The meeting is on Friday and we will call you with the details.", "en"),
+        ("Die Besprechung ist am Freitag und wir rufen Sie an, aber nicht heute.", "de"),
+        ("La réunion est vendredi et nous vous appelons pour les détails.", "fr"),
+    ],
+)
+def test_detect_language(text, expected):
+    assert detect_language(text, ["en", "de", "fr"]) == expected
+
+
+def test_detect_language_tie_goes_to_default():
+    # "la" is a function word in both French and Spanish
+    assert detect_language("la", ["fr", "es"], default="es") == "es"
+    assert detect_language("la", ["es", "fr"], default="fr") == "fr"
+    assert detect_language("x = foo(1)", ["en", "de"], default="de") == "de"
+
+
+def test_detect_language_needs_two_known_candidates():
+    text = "Die Besprechung ist nicht heute."
+    assert detect_language(text, ["de"], default="en") == "en"
+    assert detect_language(text, ["de", "xx"], default="en") == "en"
+
+
+def test_model_cache_keeps_least_recently_used_order():
+    cache, loads = make_cache(max_models=3)
+    for language in ("en", "de", "fr", "en"):
+        cache.get(language)
+    assert cache.loaded_languages == ["de", "fr", "en"]
+    assert loads == ["en", "de", "fr"]
+
+
+def test_model_cache_evicts_by_count():
+    cache, loads = make_cache(max_models=2)
+    for language in ("en", "de", "en", "fr"):
+        cache.get(language)
+    assert cache.loaded_languages == ["en", "fr"]
+    cache.get("de")
+    assert loads == ["en", "de", "fr", "de"]
+
+
+def test_model_cache_evicts_by_memory():
+    sizes = {"en": 500.0, "de": 400.0, "fr": 300.0}
+    cache, _ = make_cache(max_models=5, memory_limit_mb=1000, size_estimator=sizes.get)
+    cache.get("en")
+    cache.get("de")
+    cache.get("fr")
+    assert cache.loaded_languages == ["de", "fr"]
+    assert cache.memory_mb == 700.0
+
+
+def test_model_cache_always_keeps_requested_model():
+    cache, _ = make_cache(max_models=1, memory_limit_mb=100, size_estimator=lambda lang: 500.0)
+    assert cache.get("en") == "en-engine"
+    assert cache.get("de") == "de-engine"
+    assert cache.loaded_languages == ["de"]
+
+
+def test_model_cache_collects_garbage_only_after_eviction(monkeypatch):
+    collections = []
+    monkeypatch.setattr(languages.gc, "collect", lambda: collections.append(1))
+    cache, _ = make_cache(max_models=2)
+
+    cache.get("en")
+    cache.get("de")
+    cache.get("en")
+    assert collections == []
+
+    cache.get("fr")
+    assert collections == [1]
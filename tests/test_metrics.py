@@ -0,0 +1,80 @@
+"""Tests for metrics export and reading."""
+
+import pytest
+
+from scrub.metrics import (
+    MetricsExporter,
+    ScrubMetrics,
+    parse_prometheus,
+    read_metrics,
+    shared_exporter,
+)
+
+
+def test_read_metrics_falls_back_to_file_without_socket_server(tmp_path):
+    path = tmp_path / "metrics.prom"
+    path.write_text(ScrubMetrics().render())
+    text = read_metrics(path=path, socket_path=tmp_path / "metrics.sock")
+    assert text == path.read_text()
+
+
+def test_read_metrics_without_file_reports_socket_error(tmp_path):
+    with pytest.raises(OSError):
+        read_metrics(socket_path=tmp_path / "metrics.sock")
+
+
+def test_shared_exporter_is_one_per_target(tmp_path):
+    path = tmp_path / "metrics.prom"
+    first = shared_exporter(path=path, interval=60)
+    try:
+        assert shared_exporter(path=str(path), interval=60) is first
+        assert shared_exporter(path=tmp_path / "other.prom", interval=60) is not first
+    finally:
+        first.stop()
+
+
+def test_cache_counters_survive_restore():
+    metrics = ScrubMetrics()
+    metrics.observe_cache("models", hit=False)
+    metrics.observe_cache("models", hit=True)
+    restored = ScrubMetrics()
+    restored.restore(metrics.render())
+    assert (restored.cache_hits["models"], restored.cache_misses["models"]) == (1, 1)
+
+
+def analyzed_bytes(text):
+    """Total bytes analyzed according to metrics text."""
+    return parse_prometheus(text)["scrub_bytes_total"][()]
+
+
+def test_exporters_sharing_a_file_add_up(tmp_path):
+    path = tmp_path / "metrics.prom"
+    first = MetricsExporter(ScrubMetrics(), path=path, interval=60)
+    second = MetricsExporter(ScrubMetrics(), path=path, interval=60)
+
+    first.metrics.observe_analyze(0.01, 10)
+    first.dump()
+    second.metrics.observe_analyze(0.01, 1000)
+    second.dump()
+    first.metrics.observe_analyze(0.01, 5)
+    first.dump()
+    first.dump()
+
+    assert analyzed_bytes(path.read_text()) == 1015
+    assert analyzed_bytes(second.render()) == 1015
+
+
+def test_socket_served_by_another_exporter_is_left_alone(tmp_path):
+    socket_path = tmp_path / "m.sock"
+    serving = MetricsExporter(ScrubMetrics(), socket_path=socket_path)
+    serving.start()
+    try:
+        serving.metrics.observe_analyze(0.01, 42)
+        other = MetricsExporter(ScrubMetrics(), socket_path=socket_path)
+        other.start()
+        other.stop()
+
+        assert analyzed_bytes(read_metrics(socket_path=socket_path)) == 42
+    finally:
+        serving.stop()
+    assert not socket_path.exists()
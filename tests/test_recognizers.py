@@ -0,0 +1,105 @@
+"""Tests for the custom recognizers on non-ASCII text."""
+
+import pytest
+
+from scrub.recognizers import (
+    BudgetedRegex,
+    CorporateNameRecognizer,
+    DenyListRecognizer,
+    DomainRecognizer,
+    UKPhoneRecognizer,
+)
+from scrub.recognizers import linear
+from scrub.recognizers.linear import re2
+
+
+def matched(recognizer, text):
+    """Return the matched substrings, in order."""
+    results = recognizer.analyze(text=text, entities=recognizer.supported_entities)
+    return [text[r.start : r.end] for r in sorted(results, key=lambda r: r.start)]
+
+
+@pytest.mark.parametrize(
+    "name, text",
+    [
+        ("Nestlé", "We met Nestlé today."),
+        ("Acme Café", "Lunch at Acme Café, then back."),
+        ("Überbank", "Überbank approved the loan."),
+    ],
+)
+def test_corporate_name_non_ascii(name, text):
+    assert matched(CorporateNameRecognizer(company_names=[name]), text) == [name]
+
+
+def test_corporate_name_non_ascii_keeps_word_boundaries():
+    recognizer = CorporateNameRecognizer(company_names=["Nestlé"])
+    assert matched(recognizer, "Nestléx is not it") == []
+
+
+@pytest.mark.parametrize(
+    "term, text",
+    [
+        ("projet-été", "Voir projet-été pour les détails."),
+        ("Größe-tool", "Run Größe-tool now"),
+    ],
+)
+def test_deny_list_non_ascii(term, text):
+    assert matched(DenyListRecognizer(deny_list=[term]), text) == [term]
+
+
+def test_domain_non_ascii():
+    recognizer = DomainRecognizer(domains=["bücher.example"])
+    text = "Siehe https://bücher.example/katalog für Details"
+    assert matched(recognizer, text) == ["https://bücher.example/katalog"]
+
+
+def test_uk_phone_next_to_non_ascii_text():
+    text = "Téléphone: 07700 900123 – merci"
+    assert matched(UKPhoneRecognizer(), text) == ["07700 900123"]
+
+
+def test_uk_phone_with_non_breaking_space():
+    text = "Call 07700\xa0900123 today"
+    assert matched(UKPhoneRecognizer(), text) == ["07700\xa0900123"]
+
+
+def test_domain_url_stops_at_non_breaking_space():
+    recognizer = DomainRecognizer(domains=["internal.example.com"])
+    text = "See https://internal.example.com/a\xa0and more"
+    assert matched(recognizer, text) == ["https://internal.example.com/a"]
+
+
+def test_corporate_name_ascii_keeps_unicode_word_boundaries():
+    recognizer = CorporateNameRecognizer(company_names=["Acme"])
+    assert matched(recognizer, "Acmeé is not it") == []
+
+
+@pytest.mark.skipif(re2 is None, reason="google-re2 not installed")
+@pytest.mark.parametrize(
+    "pattern, engine",
+    [
+        (r"https?://example\.com(?:/[^\s]*)?", "re2"),
+        (r"\d{3}\s?\d{3}", "re2"),
+        (r"(?<=id=)\d+", "regex"),
+        (r"\bAcme\b", "regex"),
+    ],
+)
+def test_engine_selection(pattern, engine):
+    assert BudgetedRegex(pattern).engine == engine
+
+
+@pytest.mark.skipif(re2 is None, reason="google-re2 not installed")
+def test_rejected_pattern_not_logged(capfd):
+    BudgetedRegex(r"(?<=id=)\d+")
+    assert capfd.readouterr().err == ""
+
+
+def test_timeout_once_budget_is_spent(monkeypatch):
+    compiled = BudgetedRegex(r"a", timeout=1.0)
+    clock = iter(range(0, 100, 10))
+    monkeypatch.setattr(linear.time, "monotonic", lambda: next(clock))
+
+    matches = compiled.finditer("aaaa")
+    assert next(matches).group() == "a"
+    with pytest.raises(TimeoutError):
+        next(matches)